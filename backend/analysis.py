@@ -0,0 +1,197 @@
+# analysis.py
+# Asynchronous engine analysis.  Jobs run on a background asyncio loop using
+# chess.engine's asyncio API, so a long search never holds a Flask worker;
+# clients poll (or stream) the engine's info lines as they arrive.
+import asyncio
+import atexit
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+import chess
+import chess.engine
+
+from chess_engine import parse_fen
+
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", "2"))
+# Jobs kept in memory; also the most that may be queued or running at once
+ANALYSIS_MAX_JOBS = int(os.environ.get("ANALYSIS_MAX_JOBS", "1000"))
+ANALYSIS_MAX_DEPTH = int(os.environ.get("ANALYSIS_MAX_DEPTH", "30"))
+
+FINISHED = ("done", "cancelled", "error")
+
+def info_to_dict(info):
+    # JSON-friendly subset of a python-chess InfoDict
+    out = {}
+    for key in ("depth", "seldepth", "multipv", "nodes", "nps", "time"):
+        if key in info:
+            out[key] = info[key]
+    score = info.get("score")
+    if score is not None:
+        white = score.white()
+        out["score"] = {"cp": white.score(), "mate": white.mate()}
+    if "pv" in info:
+        out["pv"] = [m.uci() for m in info["pv"]]
+    return out
+
+class Job:
+    def __init__(self, fen, depth, engine_path):
+        self.id = uuid.uuid4().hex
+        self.fen = fen
+        self.depth = depth
+        self.engine_path = engine_path
+        self.status = "queued"
+        self.infos = []
+        self.bestmove = None
+        self.error = None
+        self.future = None
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    def _set(self, status, **fields):
+        # Move to `status` unless the job already finished; a finished
+        # status is final, so a late "done" can't undo a cancel or the
+        # other way round.  Returns whether the change was made.
+        with self._cond:
+            if self.finished:
+                return False
+            self.status = status
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self._cond.notify_all()
+            return True
+
+    def _add_info(self, info):
+        with self._cond:
+            self.infos.append(info)
+            self._cond.notify_all()
+
+    def wait(self, seen, timeout):
+        # Block until there are info lines past `seen` or the job finishes.
+        # Returns (new info lines, finished).
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.infos) > seen or self.finished, timeout)
+            return self.infos[seen:], self.finished
+
+    def to_dict(self, since=0):
+        with self._cond:
+            return {"id": self.id, "status": self.status, "depth": self.depth,
+                    "infos": self.infos[since:], "bestmove": self.bestmove,
+                    "error": self.error}
+
+class AnalyzerBusy(Exception):
+    pass
+
+class Analyzer:
+    def __init__(self, workers=ANALYSIS_WORKERS, max_jobs=ANALYSIS_MAX_JOBS):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._sem = None     # created on the loop thread
+        self._idle = {}      # engine path -> [(transport, protocol)], loop thread only
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever,
+                                 name="analysis-loop", daemon=True).start()
+            return self._loop
+
+    def submit(self, fen, depth, engine_path):
+        # Raises ValueError for a missing or unplayable FEN or a depth out
+        # of range, and AnalyzerBusy when max_jobs are already unfinished.
+        if not isinstance(fen, str) or not fen:
+            raise ValueError("fen is required")
+        if not 1 <= depth <= ANALYSIS_MAX_DEPTH:
+            raise ValueError("depth must be between 1 and %d" % ANALYSIS_MAX_DEPTH)
+        if not parse_fen(fen).is_valid():
+            raise ValueError("position is not valid")
+        job = Job(fen, depth, engine_path)
+        with self._lock:
+            if len(self._jobs) >= self.max_jobs:
+                for old_id in [i for i, j in self._jobs.items() if j.finished]:
+                    if len(self._jobs) < self.max_jobs:
+                        break
+                    del self._jobs[old_id]
+            if len(self._jobs) >= self.max_jobs:
+                raise AnalyzerBusy()
+            self._jobs[job.id] = job
+        loop = self._ensure_loop()
+        job.future = asyncio.run_coroutine_threadsafe(self._run(job), loop)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return None
+        # A job still waiting for a worker never gets to run its handler,
+        # so the status is set here; _run's own updates are then ignored.
+        if job._set("cancelled"):
+            job.future.cancel()
+        return job
+
+    async def _acquire_engine(self, path):
+        idle = self._idle.get(path, [])
+        while idle:
+            transport, protocol = idle.pop()
+            if not protocol.returncode.done():
+                return transport, protocol
+        return await chess.engine.popen_uci(path)
+
+    def _release_engine(self, path, engine, reuse):
+        transport, protocol = engine
+        if reuse and not protocol.returncode.done():
+            self._idle.setdefault(path, []).append(engine)
+        else:
+            transport.close()
+
+    async def _run(self, job):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.workers)
+        try:
+            async with self._sem:
+                if not job._set("running"):
+                    return
+                engine = await self._acquire_engine(job.engine_path)
+                reuse = False
+                try:
+                    limit = chess.engine.Limit(depth=job.depth)
+                    with await engine[1].analysis(chess.Board(job.fen), limit) as analysis:
+                        async for info in analysis:
+                            info = info_to_dict(info)
+                            if info:
+                                job._add_info(info)
+                        best = await analysis.wait()
+                    reuse = True
+                finally:
+                    self._release_engine(job.engine_path, engine, reuse)
+            job._set("done", bestmove=best.move.uci() if best.move else None)
+        except asyncio.CancelledError:
+            job._set("cancelled")
+            raise
+        except Exception as e:
+            job._set("error", error=str(e) or type(e).__name__)
+
+    def close(self):
+        if self._loop is None:
+            return
+        def _shutdown():
+            for engines in self._idle.values():
+                for transport, _ in engines:
+                    transport.close()
+            self._idle.clear()
+        self._loop.call_soon_threadsafe(_shutdown)
+
+analyzer = Analyzer()
+atexit.register(analyzer.close)
@@ -1,23 +1,68 @@
 # app.py
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, current_app, request, jsonify
 from flask_cors import CORS
-from models import db, User, Score
-from tictactoe_engine import minimax, check_winner
-from chess_engine import is_move_legal, apply_move, engine_move
+from sqlalchemy.exc import OperationalError
+from models import db, User, UserStats, GameStats, configure_engine, init_db
+from config import Config, engine_options
+from tictactoe_engine import (BitBoard, NotInTable, best_move, best_move_code, check_winner,
+                              decode_board, encode_board, get_table, get_game, mnk_search)
+from chess.engine import EngineError
+from chess_engine import (is_move_legal, apply_move, play_moves, engine_move, games,
+                          EnginePoolTimeout, set_cache_file, set_opening_book)
+from analysis import analyzer, AnalyzerBusy
+from score_buffer import ScoreBuffer, BufferFull, validate_score
+from response_cache import ResponseCache
+import metrics
+import json
+import math
 import os
+import time
 
-app = Flask(__name__)
-CORS(app)
-basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'db.sqlite3')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
+api = Blueprint('api', __name__)
 
-with app.app_context():
-    db.create_all()
+def create_app(config=None):
+    # Build a fully initialised app.  Nothing here runs at import time, so a
+    # pre-forking server (see wsgi.py / gunicorn.conf.py) can call this in
+    # each worker and every process gets its own DB engine, caches and
+    # background threads.  `config` is an object or a dict of overrides.
+    app = Flask(__name__)
+    CORS(app)
+    app.config.from_object(Config)
+    if isinstance(config, dict):
+        app.config.update(config)
+    elif config is not None:
+        app.config.from_object(config)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS',
+                          engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
+    db.init_app(app)
+
+    with app.app_context():
+        configure_engine(db.engine, app.config['SQLITE_PRAGMAS'])
+        metrics.init_app(app, db.engine)
+        try:
+            init_db()
+        except OperationalError:
+            # Another worker created the schema at the same moment.
+            db.session.rollback()
+            init_db()
+
+    response_cache = ResponseCache()
+    score_buffer = ScoreBuffer(app, on_flush=response_cache.bump)
+    score_buffer.start()
+    app.extensions['response_cache'] = response_cache
+    app.extensions['score_buffer'] = score_buffer
+
+    set_cache_file(app.config['ENGINE_CACHE_FILE'])
+    set_opening_book(app.config['OPENING_BOOK'])
+
+    # Solve tic-tac-toe once at startup so AI moves are table lookups
+    get_table()
+
+    app.register_blueprint(api)
+    return app
 
 # Simple auth/register
-@app.route('/register', methods=['POST'])
+@api.route('/register', methods=['POST'])
 def register():
     data = request.json
     username = data.get('username')
@@ -29,33 +74,180 @@ def register():
     db.session.add(u); db.session.commit()
     return jsonify({"ok":True, "username":username})
 
+# Read endpoints answer from response_cache; clients that send the last
+# ETag back in If-None-Match get an empty 304 while nothing has changed.
+def cached_json(build):
+    key = request.full_path
+    cache = current_app.extensions['response_cache']
+    body, etag = cache.get(key, lambda: current_app.json.dumps(build()))
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(body, mimetype='application/json')
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'no-cache'
+    return resp
+
 # Leaderboard
-@app.route('/scores', methods=['GET'])
+@api.route('/scores', methods=['GET'])
 def get_scores():
-    # aggregate
-    t_wins = Score.query.filter_by(game='tictactoe', result='win').count()
-    chess_moves = Score.query.filter_by(game='chess', result='move').count()
-    return jsonify({"tictactoe_wins": t_wins, "chess_moves": chess_moves})
+    return cached_json(scores_summary)
+
+def scores_summary():
+    # aggregate (maintained on insert, see models.record_scores)
+    t = db.session.get(GameStats, 'tictactoe')
+    c = db.session.get(GameStats, 'chess')
+    return {"tictactoe_wins": t.wins if t else 0, "chess_moves": c.moves if c else 0}
+
+# Record results: one score object, or {"scores": [...]} for a batch.
+# Rows are buffered and written in bulk, so they show up in /scores and
+# /leaderboard within SCORE_FLUSH_INTERVAL seconds.
+MAX_SCORE_BATCH = 1000
+
+@api.route('/scores', methods=['POST'])
+def post_scores():
+    data = request.json
+    items = data.get('scores') if isinstance(data, dict) and 'scores' in data else [data]
+    if not isinstance(items, list) or not items or len(items) > MAX_SCORE_BATCH:
+        return jsonify({"error":"bad_batch"}), 400
+    rows = []
+    for item in items:
+        row, reason = validate_score(item)
+        if reason:
+            return jsonify({"error": reason}), 400
+        rows.append(row)
+    try:
+        current_app.extensions['score_buffer'].add(rows)
+    except BufferFull:
+        return jsonify({"error":"busy"}), 503
+    return jsonify({"accepted": len(rows)}), 202
+
+# Per-game ranked leaderboard: most wins first, draws break ties
+MAX_PER_PAGE = 100
+
+@api.route('/leaderboard/<game>', methods=['GET'])
+def get_leaderboard(game):
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), MAX_PER_PAGE)
+    return cached_json(lambda: leaderboard_page(game, page, per_page))
+
+def leaderboard_page(game, page, per_page):
+    query = UserStats.query.filter_by(game=game)
+    rows = query.order_by(UserStats.wins.desc(), UserStats.draws.desc(), UserStats.username) \
+        .offset((page - 1) * per_page).limit(per_page).all()
+    entries = []
+    for i, r in enumerate(rows):
+        entries.append({"rank": (page - 1) * per_page + i + 1, "username": r.username,
+                        "wins": r.wins, "losses": r.losses, "draws": r.draws,
+                        "moves": r.moves, "points": r.points})
+    return {"game": game, "page": page, "per_page": per_page,
+            "total": query.count(), "entries": entries}
+
+# Search budget for boards larger than 3x3 (milliseconds)
+DEFAULT_TIME_MS = 1000
+MAX_TIME_MS = 10000
 
 # TicTacToe move: client sends board, AI plays O (server returns ai_move index)
-@app.route('/tictactoe/ai_move', methods=['POST'])
+# Optional "size" (or "rows"/"cols"), "win_length" and "time_ms" select a
+# larger m,n,k board searched with iterative deepening under a time budget.
+@api.route('/tictactoe/ai_move', methods=['POST'])
 def ttt_ai_move():
     data = request.json
-    board = data.get('board')  # list of 9: "", "X", "O"
+    board = data.get('board')  # list of rows*cols: "", "X", "O"
+    size = data.get('size', 3)
+    try:
+        rows = int(data.get('rows', size))
+        cols = int(data.get('cols', size))
+        k = int(data.get('win_length', min(rows, cols, 5)))
+        time_ms = float(data.get('time_ms', DEFAULT_TIME_MS))
+    except (TypeError, ValueError):
+        return jsonify({"error":"bad_board"}),400
+    if not math.isfinite(time_ms):
+        return jsonify({"error":"bad_time"}),400
+    time_ms = min(max(time_ms, 0), MAX_TIME_MS)
+    if (rows, cols, k) != (3, 3, 3):
+        return mnk_ai_move(board, rows, cols, k, time_ms)
     if not board or len(board)!=9:
         return jsonify({"error":"bad_board"}),400
+    try:
+        bb = BitBoard.from_list(board)
+    except ValueError:
+        return jsonify({"error":"bad_board"}),400
     # AI is O (maximizer). If game already finished return status
-    winner = check_winner(board)
+    winner = bb.winner()
     if winner:
         return jsonify({"winner": winner})
-    move = minimax(board.copy(), "O")
+    start = time.perf_counter()
+    stats = {}
+    move = best_move(board, "O", stats=stats)
+    metrics.TTT_SEARCH_TIME.observe(time.perf_counter() - start, stats["source"])
+    metrics.TTT_SEARCH_NODES.observe(stats["nodes"], stats["source"])
     if move is None:
         return jsonify({"winner": "draw"})
     ai_index = move["index"]
     return jsonify({"ai_index": ai_index})
 
+def mnk_ai_move(board, rows, cols, k, time_ms):
+    try:
+        game = get_game(rows, cols, k)
+        x, o = game.from_list(board or [])
+    except (TypeError, ValueError):
+        return jsonify({"error":"bad_board"}),400
+    winner = game.winner(x, o)
+    if winner:
+        return jsonify({"winner": winner})
+    start = time.perf_counter()
+    stats = {}
+    ai_index, score, depth = mnk_search(game, x, o, "O", time_ms, stats=stats)
+    metrics.TTT_SEARCH_TIME.observe(time.perf_counter() - start, "mnk")
+    metrics.TTT_SEARCH_NODES.observe(stats["nodes"], "mnk")
+    return jsonify({"ai_index": ai_index, "depth": depth})
+
+# Batch AI moves for many 3x3 boards in one request.  Send either
+# {"boards": [[9 cells], ...]} or {"packed": [code, ...]} where code is the
+# base-3 board encoding ("" -> 0, "X" -> 1, "O" -> 2, cell 0 least
+# significant).  Results come back in the same order, each shaped like a
+# /tictactoe/ai_move response.  Every answer is a table lookup, so boards
+# where O is not to move (or that can't arise in play) get
+# {"error": "not_o_to_move"} rather than a full search.
+MAX_BATCH = 10000
+
+@api.route('/tictactoe/ai_moves', methods=['POST'])
+def ttt_ai_moves():
+    data = request.json
+    packed = data.get('packed')
+    items = packed if packed is not None else data.get('boards')
+    if not isinstance(items, list) or len(items) > MAX_BATCH:
+        return jsonify({"error":"bad_batch"}),400
+    results = []
+    for item in items:
+        try:
+            # Only JSON integers and lists: int() would accept "7", 7.9 and
+            # true, and from_list would accept a 9-character string.
+            if packed is not None:
+                if not isinstance(item, int) or isinstance(item, bool):
+                    raise TypeError("packed board must be an integer")
+                code = item
+            else:
+                if not isinstance(item, list):
+                    raise TypeError("board must be a list")
+                BitBoard.from_list(item)
+                code = encode_board(item)
+            move = best_move_code(code, "O")
+        except NotInTable:
+            results.append({"error":"not_o_to_move"})
+            continue
+        except (TypeError, ValueError):
+            results.append({"error":"bad_board"})
+            continue
+        if move is None:
+            results.append({"winner": check_winner(decode_board(code))})
+        else:
+            results.append({"ai_index": move["index"]})
+    return jsonify({"results": results})
+
 # Chess endpoints
-@app.route('/chess/validate_move', methods=['POST'])
+@api.route('/chess/validate_move', methods=['POST'])
 def chess_validate():
     data = request.json
     fen = data.get('fen')
@@ -63,7 +255,7 @@ def chess_validate():
     ok, reason = is_move_legal(fen, uci)
     return jsonify({"legal": ok, "reason": reason})
 
-@app.route('/chess/apply_move', methods=['POST'])
+@api.route('/chess/apply_move', methods=['POST'])
 def chess_apply():
     data = request.json
     fen = data.get('fen')
@@ -74,16 +266,143 @@ def chess_apply():
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+# Validate and apply in one call.  Send {"fen", "move"} for a single move
+# or {"fen", "moves": [...]} to replay a sequence (game import, reconnect);
+# "fen" defaults to the starting position.
+MAX_REPLAY_MOVES = 1000
+
+@api.route('/chess/play', methods=['POST'])
+def chess_play():
+    data = request.json
+    if not isinstance(data, dict):
+        return jsonify({"error":"bad_request"}), 400
+    fen = data.get('fen')
+    if fen is not None and not isinstance(fen, str):
+        return jsonify({"error":"bad_fen"}), 400
+    moves = data.get('moves')
+    if moves is None and data.get('move') is not None:
+        moves = [data['move']]
+    if (not isinstance(moves, list) or len(moves) > MAX_REPLAY_MOVES
+            or not all(isinstance(m, str) for m in moves)):
+        return jsonify({"error":"bad_moves"}), 400
+    try:
+        fen, results = play_moves(fen, moves)
+    except ValueError:
+        return jsonify({"error":"bad_fen"}), 400
+    ok = all(r["legal"] for r in results)
+    return jsonify({"ok": ok, "fen": fen, "results": results})
+
+# Chess game sessions: the server keeps the board, clients send only moves
+@api.route('/chess/games', methods=['POST'])
+def chess_new_game():
+    data = request.get_json(silent=True) or {}
+    try:
+        game_id, fen = games.create(data.get('fen'))
+    except ValueError:
+        return jsonify({"error":"bad_fen"}), 400
+    return jsonify({"id": game_id, "fen": fen}), 201
+
+@api.route('/chess/games/<game_id>', methods=['GET'])
+def chess_get_game(game_id):
+    fen = games.fen(game_id)
+    if fen is None:
+        return jsonify({"error":"not_found"}), 404
+    return jsonify({"id": game_id, "fen": fen})
+
+@api.route('/chess/games/<game_id>', methods=['DELETE'])
+def chess_delete_game(game_id):
+    if not games.delete(game_id):
+        return jsonify({"error":"not_found"}), 404
+    return jsonify({"ok": True})
+
+@api.route('/chess/games/<game_id>/moves', methods=['POST'])
+def chess_game_move(game_id):
+    data = request.json
+    fen, reason = games.push(game_id, data.get('move'))
+    if reason == "not_found":
+        return jsonify({"error": reason}), 404
+    if reason:
+        return jsonify({"legal": False, "reason": reason}), 400
+    return jsonify({"legal": True, "fen": fen})
+
 # Optional engine move (requires stockfish installed and path provided)
-@app.route('/chess/engine_move', methods=['POST'])
+@api.route('/chess/engine_move', methods=['POST'])
 def chess_engine_move():
     data = request.json
     fen = data.get('fen')
     sf_path = data.get('stockfish_path')
-    mv = engine_move(fen, stockfish_path=sf_path)
+    try:
+        mv = engine_move(fen, stockfish_path=sf_path,
+                         timeout=current_app.config['ENGINE_REQUEST_TIMEOUT'])
+    except ValueError:
+        return jsonify({"error":"bad_request"}), 400
+    except EnginePoolTimeout:
+        return jsonify({"error":"busy"}), 503
+    except (EngineError, OSError):
+        return jsonify({"error":"engine_failed"}), 502
     if mv is None:
         return jsonify({"error":"engine not available"}), 400
     return jsonify({"uci": mv})
 
+# Asynchronous analysis: submit a position, then poll or stream (SSE) the
+# engine's info lines.  A job holds no request thread while it searches.
+@api.route('/chess/analysis', methods=['POST'])
+def chess_analysis_submit():
+    data = request.json
+    sf_path = data.get('stockfish_path')
+    if sf_path is None or not os.path.exists(sf_path):
+        return jsonify({"error":"engine not available"}), 400
+    try:
+        depth = int(data.get('depth', 12))
+        job = analyzer.submit(data.get('fen'), depth, sf_path)
+    except (TypeError, ValueError):
+        return jsonify({"error":"bad_request"}), 400
+    except AnalyzerBusy:
+        return jsonify({"error":"busy"}), 503
+    return jsonify({"id": job.id, "status": job.status}), 202
+
+@api.route('/chess/analysis/<job_id>', methods=['GET'])
+def chess_analysis_poll(job_id):
+    job = analyzer.get(job_id)
+    if job is None:
+        return jsonify({"error":"not_found"}), 404
+    since = request.args.get('since', 0, type=int)
+    return jsonify(job.to_dict(since=since))
+
+@api.route('/chess/analysis/<job_id>', methods=['DELETE'])
+def chess_analysis_cancel(job_id):
+    job = analyzer.cancel(job_id)
+    if job is None:
+        return jsonify({"error":"not_found"}), 404
+    return jsonify({"id": job.id, "status": job.status})
+
+@api.route('/chess/analysis/<job_id>/stream', methods=['GET'])
+def chess_analysis_stream(job_id):
+    job = analyzer.get(job_id)
+    if job is None:
+        return jsonify({"error":"not_found"}), 404
+
+    def events():
+        seen = 0
+        while True:
+            infos, finished = job.wait(seen, timeout=15)
+            for info in infos:
+                yield "data: %s\n\n" % json.dumps(info)
+            seen += len(infos)
+            if finished:
+                yield "event: done\ndata: %s\n\n" % json.dumps(job.to_dict(since=seen))
+                return
+            if not infos:
+                yield ": keepalive\n\n"
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache"})
+
+# Prometheus scrape endpoint (per worker process)
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Development server only; use wsgi.py with a multi-worker server in production
 if __name__ == '__main__':
-    app.run(host='127.0.0.1', port=5000, debug=True)
+    create_app().run(host='127.0.0.1', port=5000, debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -0,0 +1,206 @@
+# benchmarks.py
+# Reproducible micro/endpoint benchmarks for the game engines and the Flask
+# API.  Each benchmark runs a fixed corpus (seeded, so every run sees the
+# same positions), times every call, and reports ops/sec with p50/p90/p99
+# latencies.  Results can be saved as JSON and compared between commits:
+#
+#   python benchmarks.py --out before.json
+#   git checkout my-branch
+#   python benchmarks.py --out after.json --compare before.json
+#
+# --filter runs only benchmarks whose name contains the given text.
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import chess
+
+import tictactoe_engine as ttt
+from chess_engine import apply_move, is_move_legal, play_moves
+
+SEED = 1234
+
+# Standard perft test positions (chessprogramming.org "Perft Results")
+PERFT_FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+]
+
+def ttt_corpus(count, min_stones=0, rng=None):
+    # Non-terminal reachable 3x3 positions with at least min_stones marks,
+    # sampled deterministically.
+    rng = rng or random.Random(SEED)
+    table = ttt.get_table()
+    codes = [c for c in range(ttt.NUM_CODES) if table[c] != ttt.NO_ENTRY]
+    boards = [ttt.decode_board(c) for c in codes]
+    boards = [b for b in boards if 9 - b.count("") >= min_stones]
+    return [rng.choice(boards) for _ in range(count)]
+
+def chess_corpus():
+    # (fen, uci) for every legal move in every perft position, plus one
+    # illegal move per position
+    cases = []
+    for fen in PERFT_FENS:
+        board = chess.Board(fen)
+        for move in board.legal_moves:
+            cases.append((fen, move.uci()))
+        cases.append((fen, "a1a1"))
+    return cases
+
+def replay_corpus(count, length, rng=None):
+    # Random legal games from the start position, as UCI move lists
+    rng = rng or random.Random(SEED)
+    games = []
+    for _ in range(count):
+        board = chess.Board()
+        moves = []
+        for _ in range(length):
+            legal = list(board.legal_moves)
+            if not legal:
+                break
+            move = rng.choice(legal)
+            board.push(move)
+            moves.append(move.uci())
+        games.append(moves)
+    return games
+
+def measure(fn, args_list, repeat=1, warmup=20):
+    for args in args_list[:warmup]:
+        fn(*args)
+    times = []
+    total_start = time.perf_counter()
+    for _ in range(repeat):
+        for args in args_list:
+            t0 = time.perf_counter()
+            fn(*args)
+            times.append(time.perf_counter() - t0)
+    total = time.perf_counter() - total_start
+    times.sort()
+    def pct(p):
+        return times[min(len(times) - 1, int(p / 100.0 * len(times)))]
+    return {"ops": len(times), "seconds": total, "ops_per_sec": len(times) / total,
+            "p50_us": pct(50) * 1e6, "p90_us": pct(90) * 1e6, "p99_us": pct(99) * 1e6}
+
+def engine_benchmarks():
+    rng = random.Random(SEED)
+    positions = ttt_corpus(2000, rng=rng)
+    searchable = ttt_corpus(200, min_stones=2, rng=rng)
+    mnk = ttt.get_game(4, 4, 4)
+    mnk_boards = []
+    for _ in range(20):
+        cells = [""] * 16
+        for i, cell in enumerate(rng.sample(range(16), 4)):
+            cells[cell] = "X" if i % 2 == 0 else "O"
+        mnk_boards.append(mnk.from_list(cells))
+    chess_cases = chess_corpus()
+    replays = replay_corpus(20, 40, rng=rng)
+    return [
+        ("ttt.check_winner", ttt.check_winner, [(b,) for b in positions]),
+        ("ttt.minimax", ttt.minimax, [(b, ttt.player_to_move(b)) for b in searchable]),
+        ("ttt.alphabeta", lambda b, p: ttt.alphabeta(b, p, ttt.TranspositionTable()),
+         [(b, ttt.player_to_move(b)) for b in searchable]),
+        ("ttt.best_move", ttt.best_move, [(b, ttt.player_to_move(b)) for b in positions]),
+        ("ttt.mnk_search_4x4_d3", lambda x, o: ttt.mnk_search(mnk, x, o, "X", 60000, max_depth=3),
+         mnk_boards),
+        ("chess.is_move_legal", is_move_legal, chess_cases),
+        ("chess.apply_move", lambda f, m: _try_apply(f, m), chess_cases),
+        ("chess.play_moves_40", lambda ms: play_moves(None, ms), [(g,) for g in replays]),
+    ]
+
+def _try_apply(fen, uci):
+    try:
+        apply_move(fen, uci)
+    except ValueError:
+        pass
+
+def http_benchmarks(workdir):
+    from app import create_app
+    app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(workdir, "bench.sqlite3")})
+    client = app.test_client()
+    rng = random.Random(SEED)
+    boards = [b for b in ttt_corpus(500, rng=rng) if ttt.player_to_move(b) == "O"]
+    batch = {"boards": boards[:100]}
+    chess_cases = chess_corpus()[:200]
+
+    def post(path, body):
+        resp = client.post(path, json=body)
+        assert resp.status_code < 500, (path, resp.status_code)
+
+    def get(path):
+        resp = client.get(path)
+        assert resp.status_code < 500, (path, resp.status_code)
+
+    return [
+        ("http.tictactoe_ai_move", post, [("/tictactoe/ai_move", {"board": b}) for b in boards]),
+        ("http.tictactoe_ai_moves_x100", post, [("/tictactoe/ai_moves", batch)] * 50),
+        ("http.chess_validate_move", post,
+         [("/chess/validate_move", {"fen": f, "move": m}) for f, m in chess_cases]),
+        ("http.chess_play", post, [("/chess/play", {"fen": f, "move": m}) for f, m in chess_cases]),
+        ("http.scores", get, [("/scores",)] * 500),
+        ("http.leaderboard", get, [("/leaderboard/chess?page=1",)] * 500),
+    ]
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results, baseline=None):
+    header = "%-30s %12s %10s %10s %10s" % ("benchmark", "ops/sec", "p50 us", "p90 us", "p99 us")
+    if baseline:
+        header += " %9s" % "vs base"
+    print(header)
+    for name, r in results.items():
+        line = "%-30s %12.1f %10.1f %10.1f %10.1f" % (
+            name, r["ops_per_sec"], r["p50_us"], r["p90_us"], r["p99_us"])
+        base = (baseline or {}).get(name)
+        if base:
+            line += " %+8.1f%%" % ((r["ops_per_sec"] / base["ops_per_sec"] - 1) * 100)
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this text")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over each corpus")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare ops/sec against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        benches = engine_benchmarks() + http_benchmarks(workdir)
+        results = {}
+        for name, fn, cases in benches:
+            if args.filter in name:
+                results[name] = measure(fn, cases, repeat=args.repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"commit": git_commit(), "python": platform.python_version(),
+                       "platform": platform.platform(), "seed": SEED,
+                       "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    sys.exit(main())
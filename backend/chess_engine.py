@@ -2,34 +2,445 @@
 # Uses python-chess to validate moves and optionally produce engine moves.
 import chess
 import chess.engine
+import chess.polyglot
+import atexit
+import json
 import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 
-# Create and manage a Board per session in production; here we expect client to send FEN or moves.
-def is_move_legal(fen, uci_move):
+from metrics import CHESS_FEN_PARSE, CHESS_LEGAL_CHECK, ENGINE_POOL_WAIT
+
+def parse_fen(fen):
+    start = time.perf_counter()
     board = chess.Board(fen)
+    CHESS_FEN_PARSE.observe(time.perf_counter() - start)
+    return board
+
+def is_legal(board, move):
+    start = time.perf_counter()
+    legal = board.is_legal(move)
+    CHESS_LEGAL_CHECK.observe(time.perf_counter() - start)
+    return legal
+
+# Stateless helpers: the client sends the FEN with every call.  Prefer the
+# GameStore sessions below, which keep the parsed Board between moves.
+def is_move_legal(fen, uci_move):
+    board = parse_fen(fen)
     try:
         move = chess.Move.from_uci(uci_move)
     except:
         return False, "invalid_format"
-    return move in board.legal_moves, None
+    return is_legal(board, move), None
 
 def apply_move(fen, uci_move):
-    board = chess.Board(fen)
+    board = parse_fen(fen)
     move = chess.Move.from_uci(uci_move)
-    if move in board.legal_moves:
+    if is_legal(board, move):
         board.push(move)
         return board.fen()
     else:
         raise ValueError("Illegal move")
 
-# Optional: get an engine move using a stockfish binary
-def engine_move(fen, depth=12, stockfish_path=None):
-    board = chess.Board(fen)
+def play_moves(fen, uci_moves):
+    # Validate and apply a sequence of moves on one parsed board.  Returns
+    # the FEN after the last legal move and one status per input move;
+    # moves after the first rejected one are reported as "skipped".  No fen
+    # means the starting position.
+    board = parse_fen(fen or chess.STARTING_FEN)
+    statuses = []
+    failed = False
+    for uci in uci_moves:
+        if failed:
+            statuses.append({"move": uci, "legal": False, "reason": "skipped"})
+            continue
+        try:
+            move = chess.Move.from_uci(uci)
+        except (TypeError, ValueError):
+            reason = "invalid_format"
+        else:
+            reason = None if is_legal(board, move) else "illegal_move"
+        if reason:
+            failed = True
+            statuses.append({"move": uci, "legal": False, "reason": reason})
+        else:
+            board.push(move)
+            statuses.append({"move": uci, "legal": True})
+    return board.fen(), statuses
+
+# ---------------------------------------------------------------
+# Game sessions
+# ---------------------------------------------------------------
+# Boards live in memory keyed by a random game id, so a move is a single
+# is_legal + push on an existing Board instead of a FEN parse.  The store
+# is an LRU: at most GAME_STORE_SIZE games are kept, and a game untouched
+# for GAME_TTL seconds is dropped.
+
+GAME_STORE_SIZE = int(os.environ.get("GAME_STORE_SIZE", "10000"))
+GAME_TTL = float(os.environ.get("GAME_TTL", "3600"))
+
+class GameStore:
+    def __init__(self, max_games=GAME_STORE_SIZE, ttl=GAME_TTL):
+        self.max_games = max_games
+        self.ttl = ttl
+        self._games = OrderedDict()  # id -> [board, last access time]
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        # Least recently used entries sit at the front.
+        cutoff = now - self.ttl
+        while self._games:
+            gid, entry = next(iter(self._games.items()))
+            if entry[1] >= cutoff:
+                break
+            del self._games[gid]
+
+    def _touch(self, game_id):
+        now = time.monotonic()
+        self._expire(now)
+        entry = self._games.get(game_id)
+        if entry is None:
+            return None
+        entry[1] = now
+        self._games.move_to_end(game_id)
+        return entry[0]
+
+    def create(self, fen=None):
+        board = parse_fen(fen or chess.STARTING_FEN)
+        game_id = uuid.uuid4().hex
+        with self._lock:
+            self._expire(time.monotonic())
+            self._games[game_id] = [board, time.monotonic()]
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+        return game_id, board.fen()
+
+    def fen(self, game_id):
+        with self._lock:
+            board = self._touch(game_id)
+            return board.fen() if board is not None else None
+
+    def push(self, game_id, uci_move):
+        # Returns (fen, None) on success or (None, reason) where reason is
+        # "not_found", "invalid_format" or "illegal_move".
+        try:
+            move = chess.Move.from_uci(uci_move)
+        except (TypeError, ValueError):
+            return None, "invalid_format"
+        with self._lock:
+            board = self._touch(game_id)
+            if board is None:
+                return None, "not_found"
+            if not is_legal(board, move):
+                return None, "illegal_move"
+            board.push(move)
+            return board.fen(), None
+
+    def delete(self, game_id):
+        with self._lock:
+            return self._games.pop(game_id, None) is not None
+
+    def __len__(self):
+        return len(self._games)
+
+games = GameStore()
+
+# ---------------------------------------------------------------
+# Engine pool
+# ---------------------------------------------------------------
+# Starting a UCI engine (process spawn, handshake, hash allocation) costs
+# far more than a shallow search, so engines are kept alive and shared.
+# There is one bounded pool per binary path.  An engine is pinged before
+# it is handed out, dropped if it crashed mid-search, and closed after
+# sitting idle for ENGINE_IDLE_TIMEOUT seconds.
+
+ENGINE_POOL_SIZE = int(os.environ.get("ENGINE_POOL_SIZE", "2"))
+ENGINE_IDLE_TIMEOUT = float(os.environ.get("ENGINE_IDLE_TIMEOUT", "300"))
+ENGINE_CHECKOUT_TIMEOUT = float(os.environ.get("ENGINE_CHECKOUT_TIMEOUT", "30"))
+
+class EnginePoolTimeout(Exception):
+    pass
+
+class EnginePool:
+    def __init__(self, path, size=ENGINE_POOL_SIZE, idle_timeout=ENGINE_IDLE_TIMEOUT):
+        self.path = path
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._idle = []      # (engine, time it was returned)
+        self._alive = 0      # engines started, idle or checked out
+        self._cond = threading.Condition()
+        self._closed = False
+
+    @contextmanager
+    def engine(self, timeout=ENGINE_CHECKOUT_TIMEOUT):
+        start = time.perf_counter()
+        eng = self._acquire(timeout)
+        ENGINE_POOL_WAIT.observe(time.perf_counter() - start)
+        try:
+            yield eng
+        except (chess.engine.EngineTerminatedError, chess.engine.EngineError):
+            # The process died or is in an unknown state: never reuse it.
+            self._discard(eng)
+            raise
+        except BaseException:
+            self._release(eng)
+            raise
+        else:
+            self._release(eng)
+
+    def _acquire(self, timeout):
+        # An idle engine is popped under the lock but pinged (and closed if
+        # dead) outside it, so a hung engine can't stall every other
+        # checkout and return.  It still counts towards _alive meanwhile.
+        deadline = time.monotonic() + timeout
+        while True:
+            eng = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("engine pool is closed")
+                    if self._idle:
+                        eng, _ = self._idle.pop()
+                        break
+                    if self._alive < self.size:
+                        self._alive += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise EnginePoolTimeout(self.path)
+                    self._cond.wait(remaining)
+            if eng is None:
+                break
+            if self._healthy(eng):
+                return eng
+            self._discard(eng)
+        try:
+            return chess.engine.SimpleEngine.popen_uci(self.path)
+        except BaseException:
+            with self._cond:
+                self._alive -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, eng):
+        with self._cond:
+            if self._closed:
+                self._alive -= 1
+                self._close(eng)
+            else:
+                self._idle.append((eng, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, eng):
+        self._close(eng)
+        with self._cond:
+            self._alive -= 1
+            self._cond.notify()
+
+    def _healthy(self, eng):
+        try:
+            eng.ping()
+            return True
+        except (chess.engine.EngineTerminatedError, chess.engine.EngineError, TimeoutError):
+            return False
+
+    def _close(self, eng):
+        try:
+            eng.quit()
+        except Exception:
+            try:
+                eng.close()
+            except Exception:
+                pass
+
+    def reap_idle(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._cond:
+            stale = [eng for eng, t in self._idle if t < cutoff]
+            self._idle = [(eng, t) for eng, t in self._idle if t >= cutoff]
+            self._alive -= len(stale)
+            self._cond.notify_all()
+        for eng in stale:
+            self._close(eng)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = [eng for eng, _ in self._idle]
+            self._idle = []
+            self._alive -= len(idle)
+            self._cond.notify_all()
+        for eng in idle:
+            self._close(eng)
+
+_pools = {}
+_pools_lock = threading.Lock()
+_reaper = None
+
+def _reap_loop():
+    while True:
+        time.sleep(max(ENGINE_IDLE_TIMEOUT / 2, 1))
+        with _pools_lock:
+            pools = list(_pools.values())
+        for pool in pools:
+            pool.reap_idle()
+
+def get_pool(path):
+    global _reaper
+    path = os.path.abspath(path)
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = EnginePool(path)
+        if _reaper is None:
+            _reaper = threading.Thread(target=_reap_loop, name="engine-reaper", daemon=True)
+            _reaper.start()
+        return pool
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+# SimpleEngine runs a non-daemon thread per engine, and the interpreter
+# joins those before atexit handlers run, so pools have to be closed from
+# the earlier threading hook or shutdown hangs on idle engines.
+_register_atexit = getattr(threading, "_register_atexit", atexit.register)
+_register_atexit(close_pools)
+
+# ---------------------------------------------------------------
+# Opening book and engine move cache
+# ---------------------------------------------------------------
+# Most engine requests are for a few hundred opening positions.  Those are
+# answered from a Polyglot book when one is set, and every engine result
+# is remembered in an LRU keyed by (engine path, Zobrist hash, depth), so
+# two engines never share answers.  A cache file keeps the cache across
+# restarts.  create_app sets both from the
+# OPENING_BOOK and ENGINE_CACHE_FILE config values.
+
+ENGINE_CACHE_SIZE = int(os.environ.get("ENGINE_CACHE_SIZE", "50000"))
+
+class MoveCache:
+    def __init__(self, maxsize=ENGINE_CACHE_SIZE, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = OrderedDict()  # (engine path, zobrist, depth) -> uci
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path and os.path.exists(path):
+            self.load()
+
+    def get(self, key):
+        with self._lock:
+            uci = self._entries.get(key)
+            if uci is not None:
+                self._entries.move_to_end(key)
+            return uci
+
+    def put(self, key, uci):
+        with self._lock:
+            self._entries[key] = uci
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def load(self):
+        with open(self.path) as f:
+            rows = json.load(f)
+        with self._lock:
+            for row in rows[-self.maxsize:]:
+                # Older files have no engine path in the key; drop those rows
+                if len(row) == 4:
+                    path, zobrist, depth, uci = row
+                    self._entries[(path, zobrist, depth)] = uci
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            rows = [[p, z, d, uci] for (p, z, d), uci in self._entries.items()]
+            self._dirty = False
+        # A unique temp file in the same directory, so concurrent saves
+        # (two workers sharing the file) never write into each other.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp",
+                                         prefix=os.path.basename(self.path) + ".",
+                                         delete=False) as f:
+            json.dump(rows, f)
+        try:
+            os.replace(f.name, self.path)
+        except OSError:
+            os.remove(f.name)
+            raise
+
+    def __len__(self):
+        return len(self._entries)
+
+move_cache = MoveCache()
+
+def set_cache_file(path):
+    # Replace the move cache with one loaded from (and saved at exit to) path
+    global move_cache
+    move_cache = MoveCache(path=path)
+
+def _save_move_cache():
+    # Registered once; saves whichever cache is current at exit
+    move_cache.save()
+
+atexit.register(_save_move_cache)
+
+_book = None
+_book_lock = threading.Lock()
+
+def set_opening_book(path):
+    global _book
+    with _book_lock:
+        if _book is not None:
+            _book.close()
+        _book = chess.polyglot.open_reader(path) if path else None
+
+def book_move(board):
+    with _book_lock:
+        if _book is None:
+            return None
+        entry = _book.get(board)
+    return entry.move.uci() if entry is not None else None
+
+# Optional: get an engine move using a stockfish binary.  Book hits need
+# no engine at all, and cache hits are answered without starting or
+# checking out one.  Raises
+# EnginePoolTimeout if no engine frees up within timeout seconds, and
+# chess.engine.EngineError if the engine fails (after one retry on a crash).
+def engine_move(fen, depth=12, stockfish_path=None, timeout=ENGINE_CHECKOUT_TIMEOUT):
+    board = parse_fen(fen)
+    uci = book_move(board)
+    if uci is not None:
+        return uci
     if stockfish_path is None or not os.path.exists(stockfish_path):
         return None
-    engine = chess.engine.SimpleEngine.popen_uci(stockfish_path)
-    try:
-        result = engine.play(board, chess.engine.Limit(depth=depth))
-        return result.move.uci()
-    finally:
-        engine.quit()
+    key = (os.path.realpath(stockfish_path), chess.polyglot.zobrist_hash(board), depth)
+    uci = move_cache.get(key)
+    if uci is not None:
+        return uci
+    pool = get_pool(stockfish_path)
+    # One retry so a crashed engine is replaced transparently.
+    for attempt in range(2):
+        try:
+            with pool.engine(timeout) as engine:
+                result = engine.play(board, chess.engine.Limit(depth=depth))
+                break
+        except chess.engine.EngineTerminatedError:
+            if attempt:
+                raise
+    if result.move is None:
+        return None
+    uci = result.move.uci()
+    move_cache.put(key, uci)
+    return uci
@@ -0,0 +1,47 @@
+# config.py
+# Backend settings.  Every value can be overridden from the environment;
+# DATABASE_URL swaps SQLite for any SQLAlchemy URL.
+import os
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+
+def engine_options(uri):
+    if uri.startswith('sqlite'):
+        if ':memory:' in uri or uri in ('sqlite://', 'sqlite:///'):
+            # One shared connection, otherwise every connection gets its
+            # own empty in-memory database.
+            from sqlalchemy.pool import StaticPool
+            return {'poolclass': StaticPool, 'connect_args': {'check_same_thread': False}}
+        # SQLite allows one writer at a time; extra pooled connections only
+        # help readers, which WAL lets run alongside the writer.
+        return {'pool_size': int(os.environ.get('DB_POOL_SIZE', '8')),
+                'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', '8')),
+                'connect_args': {'check_same_thread': False}}
+    return {'pool_size': int(os.environ.get('DB_POOL_SIZE', '10')),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', '20')),
+            'pool_pre_ping': True,
+            'pool_recycle': 1800}
+
+class Config:
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        'DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'db.sqlite3'))
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # SQLALCHEMY_ENGINE_OPTIONS defaults to engine_options(<final URI>),
+    # filled in by create_app after overrides are applied.
+    # Applied to every new SQLite connection (ignored for other databases).
+    # WAL lets readers proceed while a write is in progress, NORMAL sync
+    # fsyncs at checkpoints instead of every commit, and busy_timeout makes
+    # a blocked writer wait instead of failing with "database is locked".
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        'cache_size': int(os.environ.get('SQLITE_CACHE_KB', '20000')) * -1,
+        'temp_store': 'memory',
+    }
+    # Polyglot opening book and persistent engine move cache (both optional)
+    OPENING_BOOK = os.environ.get('OPENING_BOOK')
+    ENGINE_CACHE_FILE = os.environ.get('ENGINE_CACHE_FILE')
+    # How long /chess/engine_move waits for a pooled engine before giving
+    # up with 503; much shorter than the pool's own checkout default.
+    ENGINE_REQUEST_TIMEOUT = float(os.environ.get('ENGINE_REQUEST_TIMEOUT', '5'))
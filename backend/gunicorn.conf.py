@@ -0,0 +1,21 @@
+# gunicorn.conf.py
+# Production server: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Chess game sessions, analysis jobs and the engine move and response
+# caches live in the memory of one worker process, and a load balancer
+# can't route a request to a particular worker.  So the default is one
+# worker that scales with threads.  Only raise WEB_CONCURRENCY if clients
+# don't use /chess/games or /chess/analysis; with more workers those
+# return 404 whenever a request lands on a worker other than the one that
+# created the game or job.
+import os
+
+bind = os.environ.get("BIND", "127.0.0.1:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+# Don't build the app in the master: engine processes, background threads
+# and SQLite connections must be created after the fork.
+preload_app = False
+timeout = 120
+graceful_timeout = 30
@@ -0,0 +1,85 @@
+# loadtest_db.py
+# Concurrent write/read throughput against a scratch SQLite database, with
+# the stock settings (rollback journal, synchronous=FULL, no busy timeout)
+# and with the tuned Config.SQLITE_PRAGMAS.
+#
+#   python loadtest_db.py --writers 8 --readers 4 --seconds 5
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from config import Config
+from models import db, GameStats, record_scores
+
+PROFILES = {
+    'default': {'journal_mode': 'delete', 'synchronous': 'full', 'busy_timeout': 0},
+    'tuned': Config.SQLITE_PRAGMAS,
+}
+
+def run(profile, writers, readers, seconds):
+    workdir = tempfile.mkdtemp()
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(workdir, 'load.sqlite3'),
+                      'SQLITE_PRAGMAS': PROFILES[profile]})
+    stop = threading.Event()
+    counts = {'writes': 0, 'write_errors': 0, 'reads': 0, 'read_errors': 0}
+    lock = threading.Lock()
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def writer(n):
+        with app.app_context():
+            while not stop.is_set():
+                try:
+                    record_scores([{'username': 'user%d' % n, 'game': 'chess', 'result': 'move'}])
+                    db.session.commit()
+                    bump('writes')
+                except OperationalError:
+                    db.session.rollback()
+                    bump('write_errors')
+
+    def reader():
+        with app.app_context():
+            while not stop.is_set():
+                try:
+                    db.session.get(GameStats, 'chess')
+                    db.session.rollback()  # end the read transaction
+                    bump('reads')
+                except OperationalError:
+                    db.session.rollback()
+                    bump('read_errors')
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    with app.app_context():
+        db.engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+    return {k: v / seconds if not k.endswith('errors') else v for k, v in counts.items()}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--profile', choices=sorted(PROFILES), action='append')
+    args = parser.parse_args()
+    for profile in args.profile or ['default', 'tuned']:
+        r = run(profile, args.writers, args.readers, args.seconds)
+        print('%-8s writes/s %8.1f  reads/s %8.1f  write errors %d  read errors %d'
+              % (profile, r['writes'], r['reads'], r['write_errors'], r['read_errors']))
+
+if __name__ == '__main__':
+    main()
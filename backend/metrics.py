@@ -0,0 +1,126 @@
+# metrics.py
+# In-process counters and histograms rendered in the Prometheus text format
+# on /metrics.  Recording is a bisect plus a locked add, so it is cheap
+# enough to run on every request.  Values are per process: with several
+# workers, scrape each one (or aggregate by instance label).
+import bisect
+import threading
+import time
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                0.0025, 0.005, 0.01)
+COUNT_BUCKETS = (0, 10, 100, 1000, 10000, 100000, 1000000)
+
+_metrics = []
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names, values, extra=""):
+    parts = ['%s="%s"' % (n, _escape(v)) for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{%s}" % ",".join(parts) if parts else ""
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = ["# HELP %s %s" % (self.name, self.help), "# TYPE %s counter" % self.name]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append("%s%s %s" % (self.name, _labels(self.labelnames, labels), value))
+        return lines
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [per-bucket counts (+Inf last), sum]
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, value, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def render(self):
+        lines = ["# HELP %s %s" % (self.name, self.help), "# TYPE %s histogram" % self.name]
+        with self._lock:
+            items = sorted((labels, (list(s[0]), s[1])) for labels, s in self._series.items())
+        for labels, (counts, total) in items:
+            running = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                running += count
+                lines.append("%s_bucket%s %d" % (
+                    self.name, _labels(self.labelnames, labels, 'le="%s"' % bound), running))
+            lines.append("%s_sum%s %s" % (self.name, _labels(self.labelnames, labels), total))
+            lines.append("%s_count%s %d" % (self.name, _labels(self.labelnames, labels), running))
+        return lines
+
+def render():
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by endpoint, method and status.",
+                        ("endpoint", "method", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency.",
+                         ("endpoint", "method"))
+TTT_SEARCH_TIME = Histogram("tictactoe_search_seconds", "Time to pick a tic-tac-toe AI move.",
+                            ("mode",), FAST_BUCKETS + LATENCY_BUCKETS[6:])
+TTT_SEARCH_NODES = Histogram("tictactoe_search_nodes", "Positions searched per tic-tac-toe AI move.",
+                             ("mode",), COUNT_BUCKETS)
+CHESS_FEN_PARSE = Histogram("chess_fen_parse_seconds", "Time to parse a FEN into a board.",
+                            (), FAST_BUCKETS)
+CHESS_LEGAL_CHECK = Histogram("chess_legal_check_seconds", "Time to check a move's legality.",
+                              (), FAST_BUCKETS)
+ENGINE_POOL_WAIT = Histogram("engine_pool_wait_seconds",
+                             "Time spent waiting to check an engine out of the pool.")
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed, by endpoint.", ("endpoint",))
+
+def init_app(app, engine):
+    # Time every request and count SQL statements issued on `engine`.
+    from flask import g, has_request_context, request
+    from sqlalchemy import event
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            endpoint = request.endpoint or "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - start, endpoint, request.method)
+            HTTP_REQUESTS.inc(endpoint, request.method, str(response.status_code))
+        return response
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            DB_QUERIES.inc(request.endpoint or "unmatched")
+        else:
+            DB_QUERIES.inc("background")
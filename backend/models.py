@@ -1,5 +1,7 @@
 # models.py
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
 db = SQLAlchemy()
@@ -16,3 +18,115 @@ class Score(db.Model):
     result = db.Column(db.String(20)) # 'win','loss','draw','move'
     value = db.Column(db.Integer, default=0)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_score_game_result', 'game', 'result'),
+        db.Index('ix_score_username_game', 'username', 'game'),
+    )
+
+# Aggregates kept up to date by record_scores, so leaderboard reads never
+# scan the Score table.
+class UserStats(db.Model):
+    username = db.Column(db.String(80), primary_key=True)
+    game = db.Column(db.String(50), primary_key=True)
+    wins = db.Column(db.Integer, default=0, nullable=False)
+    losses = db.Column(db.Integer, default=0, nullable=False)
+    draws = db.Column(db.Integer, default=0, nullable=False)
+    moves = db.Column(db.Integer, default=0, nullable=False)
+    points = db.Column(db.Integer, default=0, nullable=False)  # sum of Score.value
+
+    __table_args__ = (
+        db.Index('ix_user_stats_ranking', 'game', 'wins', 'draws'),
+    )
+
+class GameStats(db.Model):
+    game = db.Column(db.String(50), primary_key=True)
+    wins = db.Column(db.Integer, default=0, nullable=False)
+    losses = db.Column(db.Integer, default=0, nullable=False)
+    draws = db.Column(db.Integer, default=0, nullable=False)
+    moves = db.Column(db.Integer, default=0, nullable=False)
+    points = db.Column(db.Integer, default=0, nullable=False)
+
+RESULT_COLUMNS = {'win': 'wins', 'loss': 'losses', 'draw': 'draws', 'move': 'moves'}
+
+def _bump(model, keys, deltas):
+    # UPDATE ... SET col = col + delta, inserting the row on first use.
+    query = model.query.filter_by(**keys)
+    values = {getattr(model, col): getattr(model, col) + d for col, d in deltas.items()}
+    if query.update(values, synchronize_session=False):
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(model(**keys, **deltas))
+    except IntegrityError:
+        # Another writer created the row first.
+        query.update(values, synchronize_session=False)
+
+def _aggregate(rows):
+    per_user = {}
+    per_game = {}
+    for r in rows:
+        col = RESULT_COLUMNS[r['result']]
+        value = r.get('value') or 0
+        for key, acc in (((r['username'], r['game']), per_user), (r['game'], per_game)):
+            d = acc.setdefault(key, {'wins': 0, 'losses': 0, 'draws': 0, 'moves': 0, 'points': 0})
+            d[col] += 1
+            d['points'] += value
+    return per_user, per_game
+
+def record_scores(rows):
+    # Insert Score rows (dicts with username, game, result, value) and fold
+    # them into UserStats/GameStats in the current session.  One UPDATE per
+    # distinct (user, game) and game, however many rows there are.  The
+    # caller commits.
+    rows = list(rows)
+    if not rows:
+        return
+    db.session.execute(Score.__table__.insert(), [
+        {'username': r['username'], 'game': r['game'], 'result': r['result'],
+         'value': r.get('value') or 0, 'timestamp': r.get('timestamp') or datetime.utcnow()}
+        for r in rows])
+    per_user, per_game = _aggregate(rows)
+    for (username, game), deltas in per_user.items():
+        _bump(UserStats, {'username': username, 'game': game}, deltas)
+    for game, deltas in per_game.items():
+        _bump(GameStats, {'game': game}, deltas)
+
+def rebuild_aggregates():
+    # Recompute the aggregate tables from Score (for databases that predate
+    # them).
+    UserStats.query.delete()
+    GameStats.query.delete()
+    rows = db.session.query(Score.username, Score.game, Score.result, Score.value) \
+        .filter(Score.result.in_(list(RESULT_COLUMNS))).all()
+    per_user, per_game = _aggregate(
+        {'username': u, 'game': g, 'result': res, 'value': v} for u, g, res, v in rows)
+    for (username, game), deltas in per_user.items():
+        db.session.add(UserStats(username=username, game=game, **deltas))
+    for game, deltas in per_game.items():
+        db.session.add(GameStats(game=game, **deltas))
+    db.session.commit()
+
+def configure_engine(engine, sqlite_pragmas):
+    # Run the configured PRAGMAs on every new SQLite connection.
+    if engine.dialect.name != 'sqlite' or not sqlite_pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in sqlite_pragmas.items():
+            cursor.execute('PRAGMA %s=%s' % (name, value))
+        cursor.close()
+
+    # Drop connections opened before the listener was attached.
+    engine.dispose()
+
+def init_db():
+    db.create_all()
+    # create_all skips tables that already exist, so add indexes introduced
+    # after the table was first created.
+    for index in Score.__table__.indexes:
+        index.create(bind=db.engine, checkfirst=True)
+    if GameStats.query.first() is None and Score.query.first() is not None:
+        rebuild_aggregates()
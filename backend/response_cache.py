@@ -0,0 +1,48 @@
+# response_cache.py
+# Caches JSON bodies of read endpoints (/scores, /leaderboard) so dashboard
+# polling doesn't hit the database.  Entries are tagged with a version
+# counter that the score writer bumps after each flush.  The ETag is the
+# body's length and checksum only, never the process-local version, so
+# every worker gives the same data the same tag and unchanged data
+# answers If-None-Match with 304 whichever worker serves the poll.  The
+# TTL bounds staleness from writes made by other worker processes, which
+# can't bump this process's counter.
+import os
+import threading
+import time
+import zlib
+
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "2.0"))
+RESPONSE_CACHE_SIZE = 1024
+
+class ResponseCache:
+    def __init__(self, ttl=RESPONSE_CACHE_TTL, maxsize=RESPONSE_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = 0
+        self._entries = {}  # key -> (version, expires, body, etag)
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def get(self, key, build):
+        # Returns (body, etag); build() is called on a miss and must return
+        # the JSON body as a string.
+        now = time.monotonic()
+        with self._lock:
+            version = self.version
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == version and now < entry[1]:
+            return entry[2], entry[3]
+        body = build()
+        data = body.encode("utf-8")
+        etag = "%x-%08x" % (len(data), zlib.crc32(data))
+        with self._lock:
+            if self.version == version:
+                if len(self._entries) >= self.maxsize:
+                    self._entries.clear()
+                self._entries[key] = (version, now + self.ttl, body, etag)
+        return body, etag
@@ -0,0 +1,135 @@
+# score_buffer.py
+# Buffers incoming scores in memory and writes them in bulk, so high-rate
+# events (e.g. every chess 'move') don't each cost a SQLite transaction.
+# A flush happens when SCORE_BUFFER_SIZE rows are pending, every
+# SCORE_FLUSH_INTERVAL seconds, and at shutdown.
+import atexit
+import os
+import threading
+from datetime import datetime
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from models import db, record_scores, RESULT_COLUMNS
+
+SCORE_BUFFER_SIZE = int(os.environ.get("SCORE_BUFFER_SIZE", "500"))
+SCORE_FLUSH_INTERVAL = float(os.environ.get("SCORE_FLUSH_INTERVAL", "1.0"))
+# Rows kept for retry after a failed flush, beyond which new rows are refused
+SCORE_BUFFER_LIMIT = int(os.environ.get("SCORE_BUFFER_LIMIT", "100000"))
+
+# Score.value is a SQLite INTEGER (signed 64-bit)
+MIN_VALUE = -2**63
+MAX_VALUE = 2**63 - 1
+
+# Errors a retry can't fix: the rows themselves are bad
+BAD_ROW_ERRORS = (IntegrityError, DataError, OverflowError)
+
+def validate_score(data):
+    # Returns (row, None) or (None, reason)
+    if not isinstance(data, dict):
+        return None, "bad_score"
+    username = data.get('username')
+    game = data.get('game')
+    result = data.get('result')
+    value = data.get('value', 0)
+    if not isinstance(username, str) or not username or len(username) > 80:
+        return None, "bad_username"
+    if not isinstance(game, str) or not game or len(game) > 50:
+        return None, "bad_game"
+    if not isinstance(result, str) or result not in RESULT_COLUMNS:
+        return None, "bad_result"
+    if not isinstance(value, int) or isinstance(value, bool) or not MIN_VALUE <= value <= MAX_VALUE:
+        return None, "bad_value"
+    return {'username': username, 'game': game, 'result': result,
+            'value': value, 'timestamp': datetime.utcnow()}, None
+
+class BufferFull(Exception):
+    pass
+
+class ScoreBuffer:
+    def __init__(self, app, max_rows=SCORE_BUFFER_SIZE, interval=SCORE_FLUSH_INTERVAL,
+                 limit=SCORE_BUFFER_LIMIT, on_flush=None):
+        self.app = app
+        self.on_flush = on_flush  # called after rows are committed
+        self.max_rows = max_rows
+        self.interval = interval
+        self.limit = limit
+        self._rows = []
+        self._lock = threading.Lock()        # guards _rows
+        self._flush_lock = threading.Lock()  # one writer at a time
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="score-flush", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def add(self, rows):
+        with self._lock:
+            if len(self._rows) + len(rows) > self.limit:
+                raise BufferFull()
+            self._rows.extend(rows)
+            full = len(self._rows) >= self.max_rows
+        if full:
+            self.flush()
+
+    def pending(self):
+        return len(self._rows)
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            with self.app.app_context():
+                try:
+                    record_scores(rows)
+                    db.session.commit()
+                    written = len(rows)
+                except BAD_ROW_ERRORS:
+                    db.session.rollback()
+                    written = self._write_each(rows)
+                except Exception:
+                    db.session.rollback()
+                    self._requeue(rows, "score flush failed")
+                    return 0
+            if written and self.on_flush is not None:
+                self.on_flush()
+            return written
+
+    def _write_each(self, rows):
+        # Some row in the batch can never be written.  Write the rows one at
+        # a time and drop the bad ones, so they can't block every later flush.
+        written = dropped = 0
+        for i, row in enumerate(rows):
+            try:
+                record_scores([row])
+                db.session.commit()
+                written += 1
+            except BAD_ROW_ERRORS:
+                db.session.rollback()
+                dropped += 1
+                self.app.logger.warning("dropped unwritable score row: %r", row)
+            except Exception:
+                db.session.rollback()
+                self._requeue(rows[i:], "score write failed")
+                break
+        if dropped:
+            self.app.logger.error("score flush dropped %d unwritable rows", dropped)
+        return written
+
+    def _requeue(self, rows, message):
+        self.app.logger.exception("%s, %d rows requeued", message, len(rows))
+        with self._lock:
+            self._rows[:0] = rows
+
+    def close(self):
+        self._stop.set()
+        self.flush()
@@ -0,0 +1,6 @@
+# conftest.py
+# Tests import the backend modules the same way app.py does.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# fake_uci.py
+# Minimal UCI engine for testing the engine pool without Stockfish.  It
+# plays the alphabetically first legal move.  If FAKE_UCI_CRASH_FILE names
+# an existing file, the next "go" deletes it and exits mid-search, like a
+# crashed engine; a file containing "always" is kept, so every search
+# crashes.
+import os
+import sys
+
+import chess
+
+def main():
+    board = chess.Board()
+    for line in sys.stdin:
+        parts = line.split()
+        if not parts:
+            continue
+        cmd = parts[0]
+        if cmd == "uci":
+            print("id name Fake\nuciok", flush=True)
+        elif cmd == "isready":
+            print("readyok", flush=True)
+        elif cmd == "position":
+            if parts[1] == "startpos":
+                board, rest = chess.Board(), parts[2:]
+            else:
+                board, rest = chess.Board(" ".join(parts[2:8])), parts[8:]
+            for uci in rest[1:] if rest and rest[0] == "moves" else []:
+                board.push_uci(uci)
+        elif cmd == "go":
+            crash_file = os.environ.get("FAKE_UCI_CRASH_FILE")
+            if crash_file and os.path.exists(crash_file):
+                with open(crash_file) as f:
+                    if f.read() != "always":
+                        os.remove(crash_file)
+                sys.exit(1)
+            move = min(board.legal_moves, key=lambda m: m.uci())
+            print("info depth 1 score cp 10 pv %s" % move.uci(), flush=True)
+            print("bestmove %s" % move.uci(), flush=True)
+        elif cmd == "quit":
+            break
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# test_analysis.py
+# Analyzer job lifecycle against tests/fake_uci.py.  Run from backend/:
+# python -m pytest tests
+import os
+
+import chess
+
+from analysis import Analyzer, Job
+
+FAKE_UCI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_uci.py")
+
+def test_finished_job_is_not_cancelled():
+    analyzer = Analyzer(workers=1)
+    job = analyzer.submit(chess.STARTING_FEN, 1, FAKE_UCI)
+    job.future.result(timeout=10)
+    assert job.status == "done" and job.bestmove == "a2a3"
+    assert analyzer.cancel(job.id) is job
+    assert job.status == "done"
+    analyzer.close()
+
+def test_cancelled_job_ignores_late_updates():
+    job = Job(chess.STARTING_FEN, 1, FAKE_UCI)
+    assert job._set("cancelled")
+    assert not job._set("running")
+    assert not job._set("done", bestmove="a2a3")
+    assert job.status == "cancelled" and job.bestmove is None
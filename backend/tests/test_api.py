@@ -0,0 +1,53 @@
+# test_api.py
+# Request validation on the Flask routes.  Run from backend/:
+# python -m pytest tests
+import pytest
+
+from app import create_app
+from response_cache import ResponseCache
+
+@pytest.fixture
+def client(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'test.sqlite3'),
+    })
+    yield app.test_client()
+    app.extensions['score_buffer'].close()
+
+def test_ai_moves_rejects_non_integer_packed_items(client):
+    resp = client.post('/tictactoe/ai_moves', json={'packed': [1, "1", 1.0, True, None]})
+    assert resp.get_json()["results"] == [{"ai_index": 4}] + [{"error": "bad_board"}] * 4
+
+def test_ai_moves_rejects_non_list_boards(client):
+    resp = client.post('/tictactoe/ai_moves',
+                       json={'boards': [["X"] + [""] * 8, "XOXOXOXOX", {"0": "X"}]})
+    assert resp.get_json()["results"] == [{"ai_index": 4}] + [{"error": "bad_board"}] * 2
+
+@pytest.mark.parametrize("body, error", [
+    ({}, "bad_moves"),
+    ({"fen": None}, "bad_moves"),
+    ({"move": 5}, "bad_moves"),
+    ({"moves": ["e2e4", 5]}, "bad_moves"),
+    ({"moves": "e2e4"}, "bad_moves"),
+    ({"fen": 5, "move": "e2e4"}, "bad_fen"),
+    ({"fen": "not a fen", "move": "e2e4"}, "bad_fen"),
+])
+def test_chess_play_rejects_bad_fields(client, body, error):
+    resp = client.post('/chess/play', json=body)
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": error}
+
+def test_chess_play_single_move(client):
+    resp = client.post('/chess/play', json={"move": "e2e4"})
+    assert resp.status_code == 200
+    assert resp.get_json()["ok"] is True
+
+def test_etag_depends_only_on_the_body():
+    # Two workers whose caches have seen different numbers of flushes
+    first, second = ResponseCache(), ResponseCache()
+    second.bump()
+    second.bump()
+    body, etag = first.get("scores", lambda: '{"scores": []}')
+    assert second.get("scores", lambda: body) == (body, etag)
+    assert first.get("other", lambda: '{"scores": [1]}')[1] != etag
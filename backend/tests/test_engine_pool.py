@@ -0,0 +1,162 @@
+# test_engine_pool.py
+# EnginePool and engine_move against tests/fake_uci.py, so no Stockfish is
+# needed.  Run from backend/: python -m pytest tests
+import os
+import subprocess
+import sys
+import threading
+from contextlib import ExitStack
+
+import chess
+import pytest
+
+import chess_engine
+from app import create_app
+from chess_engine import EnginePool, EnginePoolTimeout, MoveCache, engine_move
+
+FAKE_UCI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_uci.py")
+START_FEN = chess.STARTING_FEN
+
+@pytest.fixture
+def pool():
+    pool = EnginePool(FAKE_UCI, size=1)
+    yield pool
+    pool.close()
+
+@pytest.fixture
+def client(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'test.sqlite3'),
+        'ENGINE_REQUEST_TIMEOUT': 0.1,
+    })
+    yield app.test_client()
+    app.extensions['score_buffer'].close()
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    # Fresh move cache and pools, so every engine_move reaches an engine
+    monkeypatch.setattr(chess_engine, "move_cache", MoveCache())
+    yield
+    chess_engine.close_pools()
+
+def test_checkout_reuses_engine(pool):
+    with pool.engine() as first:
+        first.play(chess.Board(), chess.engine.Limit(depth=1))
+    with pool.engine() as second:
+        pass
+    assert second is first
+    assert pool._alive == 1
+
+def test_checkout_times_out_when_pool_is_busy(pool):
+    with pool.engine():
+        with pytest.raises(EnginePoolTimeout):
+            with pool.engine(timeout=0.1):
+                pass
+
+def test_dead_idle_engine_is_replaced_outside_the_lock(pool, monkeypatch):
+    with pool.engine() as first:
+        pass
+    first.protocol.transport.kill()
+    lock_free = []
+    healthy = pool._healthy
+
+    def try_lock():
+        if pool._cond.acquire(timeout=1):
+            pool._cond.release()
+            lock_free.append(True)
+        else:
+            lock_free.append(False)
+
+    def checked_healthy(eng):
+        # Another thread must be able to take the pool lock during the ping
+        t = threading.Thread(target=try_lock)
+        t.start()
+        t.join()
+        return healthy(eng)
+
+    monkeypatch.setattr(pool, "_healthy", checked_healthy)
+    with pool.engine() as second:
+        pass
+    assert second is not first
+    assert lock_free == [True]
+    assert pool._alive == 1 and len(pool._idle) == 1
+
+def test_crashed_engine_is_replaced(tmp_path, monkeypatch):
+    crash_file = tmp_path / "crash"
+    crash_file.write_text("")
+    monkeypatch.setenv("FAKE_UCI_CRASH_FILE", str(crash_file))
+    assert engine_move(START_FEN, depth=1, stockfish_path=FAKE_UCI) == "a2a3"
+    assert not crash_file.exists()  # the first engine did crash
+    pool = chess_engine.get_pool(FAKE_UCI)
+    assert pool._alive == 1 and len(pool._idle) == 1
+
+def test_engine_move_route_returns_503_when_pool_is_busy(client):
+    pool = chess_engine.get_pool(FAKE_UCI)
+    with ExitStack() as stack:
+        for _ in range(pool.size):
+            stack.enter_context(pool.engine())
+        resp = client.post('/chess/engine_move',
+                           json={'fen': START_FEN, 'stockfish_path': FAKE_UCI})
+    assert resp.status_code == 503
+    assert resp.get_json() == {"error": "busy"}
+
+def test_engine_move_route_returns_502_when_engine_keeps_crashing(client, tmp_path, monkeypatch):
+    crash_file = tmp_path / "crash"
+    crash_file.write_text("always")
+    monkeypatch.setenv("FAKE_UCI_CRASH_FILE", str(crash_file))
+    resp = client.post('/chess/engine_move',
+                       json={'fen': START_FEN, 'stockfish_path': FAKE_UCI})
+    assert resp.status_code == 502
+    assert resp.get_json() == {"error": "engine_failed"}
+
+def test_move_cache_is_keyed_by_engine_path():
+    assert engine_move(START_FEN, depth=1, stockfish_path=FAKE_UCI) == "a2a3"
+    (key,) = chess_engine.move_cache._entries
+    assert key[0] == os.path.realpath(FAKE_UCI) and key[2] == 1
+
+def test_move_cache_file_round_trip(tmp_path):
+    path = str(tmp_path / "moves.json")
+    cache = MoveCache(path=path)
+    cache.put(("/engines/a", 123, 12), "e2e4")
+    cache.put(("/engines/b", 123, 12), "d2d4")
+    cache.save()
+    assert sorted(os.listdir(tmp_path)) == ["moves.json"]  # no temp files left
+    loaded = MoveCache(path=path)
+    assert loaded.get(("/engines/a", 123, 12)) == "e2e4"
+    assert loaded.get(("/engines/b", 123, 12)) == "d2d4"
+
+def test_move_cache_drops_rows_without_engine_path(tmp_path):
+    path = tmp_path / "moves.json"
+    path.write_text('[[123, 12, "e2e4"], ["/engines/a", 123, 12, "d2d4"]]')
+    cache = MoveCache(path=str(path))
+    assert len(cache) == 1 and cache.get(("/engines/a", 123, 12)) == "d2d4"
+
+def test_exit_saves_the_current_cache(tmp_path):
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    chess_engine.set_cache_file(str(first))
+    chess_engine.set_cache_file(str(second))
+    chess_engine.move_cache.put(("/engines/a", 1, 1), "e2e4")
+    chess_engine._save_move_cache()
+    assert second.exists() and not first.exists()
+
+def test_idle_engines_are_reaped():
+    pool = EnginePool(FAKE_UCI, size=2, idle_timeout=0)
+    with pool.engine() as eng:
+        pass
+    pool.reap_idle()
+    assert pool._idle == [] and pool._alive == 0
+    with pytest.raises(chess.engine.EngineTerminatedError):
+        eng.ping()
+    pool.close()
+
+def test_exit_does_not_hang_after_engine_use():
+    # SimpleEngine threads are non-daemon; close_pools must run before the
+    # interpreter joins them.
+    code = ("import chess, chess_engine; "
+            "print(chess_engine.engine_move(chess.STARTING_FEN, 1, %r))" % FAKE_UCI)
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run([sys.executable, "-c", code], cwd=backend, timeout=20,
+                          capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "a2a3"
@@ -0,0 +1,65 @@
+# test_tictactoe_engine.py
+# alphabeta against plain minimax on every position reachable from the
+# empty board.  Run from backend/: python -m pytest tests
+import threading
+
+from tictactoe_engine import TranspositionTable, alphabeta, check_winner, minimax
+
+def reachable_positions():
+    # Every board reachable with X moving first, finished ones included
+    seen = set()
+    stack = [("",) * 9]
+    while stack:
+        board = stack.pop()
+        if board in seen:
+            continue
+        seen.add(board)
+        if check_winner(list(board)) or "" not in board:
+            continue
+        player = "X" if board.count("X") == board.count("O") else "O"
+        for i, cell in enumerate(board):
+            if cell == "":
+                stack.append(board[:i] + (player,) + board[i + 1:])
+    return [list(b) for b in sorted(seen)]
+
+POSITIONS = reachable_positions()
+
+def test_alphabeta_matches_minimax_everywhere():
+    # One table for the whole sweep, so entries stored under one root's
+    # window are reused under others.
+    tt = TranspositionTable()
+    checked = 0
+    for board in POSITIONS:
+        for player in ("X", "O"):
+            assert alphabeta(board, player, tt) == minimax(board, player), (board, player)
+            checked += 1
+    assert len(POSITIONS) == 5478 and checked == 10956
+
+def test_alphabeta_reports_nodes_per_call():
+    board = ["X", "", "", "", "O", "", "", "", ""]
+    stats = {}
+    alphabeta(board, "X", TranspositionTable(), stats)
+    cold = stats["nodes"]
+    tt = TranspositionTable()
+    alphabeta(board, "X", tt)
+    alphabeta(board, "X", tt, stats)
+    assert 0 < stats["nodes"] < cold
+
+def test_shared_table_survives_concurrent_searches():
+    tt = TranspositionTable(maxsize=64)  # small, so threads evict each other
+    errors = []
+
+    def search(boards):
+        try:
+            for board in boards:
+                for player in ("X", "O"):
+                    assert alphabeta(board, player, tt) == minimax(board, player)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=search, args=(POSITIONS[i::4],)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
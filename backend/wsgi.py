@@ -0,0 +1,7 @@
+# wsgi.py
+# WSGI entry point: gunicorn -c gunicorn.conf.py wsgi:app
+# Importing this module builds the app, so each worker that imports it
+# after the fork gets its own engines, caches and DB connections.
+from app import create_app
+
+app = create_app()
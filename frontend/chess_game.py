@@ -31,6 +31,7 @@ class ChessScreen(Screen):
 
         self.grid = GridLayout(cols=8, spacing=1, size_hint=(1, 0.84))
         self.buttons = []
+        self.build_squares()
         self.draw_board()
         root.add_widget(self.grid)
 
@@ -68,18 +69,13 @@ class ChessScreen(Screen):
             ['♖', '♘', '♗', '♕', '♔', '♗', '♘', '♖']
         ]
 
-    def draw_board(self):
-        self.grid.clear_widgets()
-        self.buttons = []
-        for row_idx, row in enumerate(self.board):
-            for col_idx, cell in enumerate(row):
-                is_light = (row_idx + col_idx) % 2 == 0
-                bg_color = (0.9, 0.8, 0.6, 1) if is_light else (0.6, 0.4, 0.2, 1)
-                
+    def build_squares(self):
+        # The 64 squares are created once; moves only update the ones that change
+        for row_idx in range(8):
+            for col_idx in range(8):
                 b = Button(
-                    text=cell, 
                     font_size=32,
-                    background_color=bg_color,
+                    background_color=self.square_color(row_idx, col_idx),
                     background_normal='',
                     color=(0, 0, 0, 1)
                 )
@@ -89,6 +85,21 @@ class ChessScreen(Screen):
                 self.buttons.append(b)
                 self.grid.add_widget(b)
 
+    def square_color(self, row, col):
+        if self.selected == (row, col):
+            return (0.3, 0.8, 0.3, 1)
+        return (0.9, 0.8, 0.6, 1) if (row + col) % 2 == 0 else (0.6, 0.4, 0.2, 1)
+
+    def update_square(self, row, col):
+        b = self.buttons[row * 8 + col]
+        b.text = self.board[row][col]
+        b.background_color = self.square_color(row, col)
+
+    def draw_board(self):
+        for row_idx in range(8):
+            for col_idx in range(8):
+                self.update_square(row_idx, col_idx)
+
     def is_white_piece(self, piece):
         return piece in ['♔', '♕', '♖', '♗', '♘', '♙']
 
@@ -105,7 +116,7 @@ class ChessScreen(Screen):
                 if (self.white_turn and self.is_white_piece(piece)) or \
                    (not self.white_turn and self.is_black_piece(piece)):
                     self.selected = (row, col)
-                    btn.background_color = (0.3, 0.8, 0.3, 1)
+                    self.update_square(row, col)
                     self.status.text = f"Selected {piece} - Choose destination"
         else:
             src_row, src_col = self.selected
@@ -129,7 +140,8 @@ class ChessScreen(Screen):
                 self.status.text = "Invalid move - try again"
             
             self.selected = None
-            self.draw_board()
+            self.update_square(src_row, src_col)
+            self.update_square(row, col)
 
     def reset_board(self):
         self.board = self.create_initial_board()
@@ -0,0 +1,105 @@
+# game_loop.py
+# Fixed-timestep loop for the real-time screens.  Kivy calls _tick once per
+# frame with however much time passed; the loop runs `update` in whole
+# `step`-sized ticks from an accumulator, so a stalled frame is caught up
+# instead of slowing the game down, and calls `render(alpha)` with the
+# fraction of the next tick already elapsed so drawing can interpolate.
+# More than `max_steps` ticks in one frame are dropped rather than run, so a
+# long stall can't spiral into ever longer frames.
+#
+#   GAME_STATS=1   show an FPS / update / draw / dropped overlay and log it
+import os
+import time
+
+from kivy.clock import Clock
+from kivy.logger import Logger
+from kivy.uix.label import Label
+
+GAME_STATS = os.environ.get("GAME_STATS") == "1"
+STATS_INTERVAL = 1.0  # seconds between overlay/log refreshes
+
+class FrameStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.ticks = 0
+        self.dropped = 0
+        self.update_time = 0.0
+        self.draw_time = 0.0
+        self.started = time.perf_counter()
+
+    def summary(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "fps": self.frames / elapsed,
+            "update_ms": self.update_time / max(self.ticks, 1) * 1000,
+            "draw_ms": self.draw_time / max(self.frames, 1) * 1000,
+            "dropped": self.dropped,
+        }
+
+class GameLoop:
+    def __init__(self, update, render=None, step=1 / 60.0, max_steps=5, name="game",
+                 show_stats=GAME_STATS):
+        self.update = update        # update(step), once per tick
+        self.render = render        # render(alpha), once per frame
+        self.step = step
+        self.max_steps = max_steps
+        self.name = name
+        self.show_stats = show_stats
+        self.stats = FrameStats()
+        self.overlay = Label(size_hint=(1, None), height=20, font_size=12,
+                             color=(0.7, 0.9, 0.7, 1)) if show_stats else None
+        self._accumulator = 0.0
+        self._event = None
+        self._stats_event = None
+
+    @property
+    def running(self):
+        return self._event is not None
+
+    def start(self):
+        self.stop()
+        self._accumulator = 0.0
+        self.stats.reset()
+        self._event = Clock.schedule_interval(self._tick, 0)
+        if self.show_stats:
+            self._stats_event = Clock.schedule_interval(self._report, STATS_INTERVAL)
+
+    def stop(self):
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        if self._stats_event is not None:
+            self._stats_event.cancel()
+            self._stats_event = None
+
+    def _tick(self, dt):
+        self._accumulator += dt
+        steps = 0
+        while self._accumulator >= self.step and self._event is not None:
+            if steps == self.max_steps:
+                dropped = int(self._accumulator // self.step)
+                self.stats.dropped += dropped
+                self._accumulator -= dropped * self.step
+                break
+            t0 = time.perf_counter()
+            self.update(self.step)
+            self.stats.update_time += time.perf_counter() - t0
+            self.stats.ticks += 1
+            self._accumulator -= self.step
+            steps += 1
+        if self.render is not None:
+            t0 = time.perf_counter()
+            self.render(self._accumulator / self.step)
+            self.stats.draw_time += time.perf_counter() - t0
+        self.stats.frames += 1
+
+    def _report(self, dt):
+        s = self.stats.summary()
+        text = "%.0f fps | update %.2f ms | draw %.2f ms | dropped %d" % (
+            s["fps"], s["update_ms"], s["draw_ms"], s["dropped"])
+        self.overlay.text = text
+        Logger.info("GameLoop: %s: %s", self.name, text)
+        self.stats.reset()
@@ -0,0 +1,226 @@
+# game_models.py
+# The rules of each mini-game, with no Kivy dependency.  The screens in
+# main.py draw and drive these models; simulate.py plays them headless.
+import random
+from collections import deque
+
+from tictactoe_engine import best_move, check_winner
+
+# =====================================================
+# TIC TAC TOE
+# =====================================================
+
+class TicTacToeGame:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.board = [""]*9
+        self.winner = None  # "X", "O" or "draw" once the game is over
+
+    @property
+    def over(self):
+        return self.winner is not None
+
+    def to_move(self):
+        return "X" if self.board.count("X") == self.board.count("O") else "O"
+
+    def legal_moves(self):
+        if self.over:
+            return []
+        return [i for i, cell in enumerate(self.board) if cell == ""]
+
+    def play(self, idx, player=None):
+        # Returns False (and changes nothing) for an illegal move
+        player = player or self.to_move()
+        if self.over or self.board[idx] != "" or player != self.to_move():
+            return False
+        self.board[idx] = player
+        self.winner = check_winner(self.board)
+        return True
+
+def ttt_random_policy(game, rng):
+    return rng.choice(game.legal_moves())
+
+def ttt_ai_policy(game, rng):
+    move = best_move(game.board, game.to_move())
+    return move["index"]
+
+TTT_POLICIES = {"random": ttt_random_policy, "ai": ttt_ai_policy}
+
+# =====================================================
+# CHESS (free-move rules: any own piece to any square
+# not holding an own piece, capturing the king wins)
+# =====================================================
+
+WHITE_PIECES = {'♔', '♕', '♖', '♗', '♘', 'a'}
+BLACK_PIECES = {'♚', '♛', '♜', '♝', '♞', '1'}
+KINGS = {'♔': "white", '♚': "black"}
+
+class ChessGame:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.board = self.initial_board()
+        self.white_turn = True
+        self.winner = None  # "white" or "black" once a king is taken
+        self.plies = 0
+
+    @staticmethod
+    def initial_board():
+        return [
+            ['♜', '♞', '♝', '♛', '♚', '♝', '♞', '♜'],
+            ['1', '1', '1', '1', '1', '1', '1', '1'],
+            ['', '', '', '', '', '', '', ''],
+            ['', '', '', '', '', '', '', ''],
+            ['', '', '', '', '', '', '', ''],
+            ['', '', '', '', '', '', '', ''],
+            ['a', 'a', 'a', 'a', 'a', 'a', 'a', 'a'],
+            ['♖', '♘', '♗', '♕', '♔', '♗', '♘', '♖']
+        ]
+
+    @property
+    def over(self):
+        return self.winner is not None
+
+    def own_pieces(self):
+        return WHITE_PIECES if self.white_turn else BLACK_PIECES
+
+    def can_select(self, row, col):
+        return not self.over and self.board[row][col] in self.own_pieces()
+
+    def can_move(self, src, dst):
+        return (self.can_select(*src) and src != dst
+                and self.board[dst[0]][dst[1]] not in self.own_pieces())
+
+    def move(self, src, dst):
+        # Returns False (and changes nothing) for an illegal move
+        if not self.can_move(src, dst):
+            return False
+        captured = self.board[dst[0]][dst[1]]
+        self.board[dst[0]][dst[1]] = self.board[src[0]][src[1]]
+        self.board[src[0]][src[1]] = ''
+        if captured in KINGS:
+            self.winner = "black" if KINGS[captured] == "white" else "white"
+        self.white_turn = not self.white_turn
+        self.plies += 1
+        return True
+
+    def legal_moves(self):
+        own = self.own_pieces()
+        squares = [(r, c) for r in range(8) for c in range(8)]
+        sources = [sq for sq in squares if self.board[sq[0]][sq[1]] in own]
+        targets = [sq for sq in squares if self.board[sq[0]][sq[1]] not in own]
+        return [(src, dst) for src in sources for dst in targets]
+
+def chess_random_policy(game, rng):
+    return rng.choice(game.legal_moves())
+
+def chess_capture_policy(game, rng):
+    # Take the king if possible, else any capture, else a random move
+    moves = game.legal_moves()
+    captures = [m for m in moves if game.board[m[1][0]][m[1][1]] != '']
+    kings = [m for m in captures if game.board[m[1][0]][m[1][1]] in KINGS]
+    return rng.choice(kings or captures or moves)
+
+CHESS_POLICIES = {"random": chess_random_policy, "capture": chess_capture_policy}
+
+# =====================================================
+# SNAKE
+# =====================================================
+
+DIRECTIONS = [(0, 1), (0, -1), (-1, 0), (1, 0)]
+
+class SnakeGame:
+    # The snake is a deque (head first) and `occupied` holds its cells for
+    # constant-time collision checks; `free` lists every other cell with
+    # `free_index` mapping a cell to its slot, so a cell is added or removed
+    # with a swap-pop and an apple is one random choice away.
+    def __init__(self, cells=30, rng=None):
+        self.cells = cells
+        self.rng = rng or random.Random()
+        self.reset()
+
+    def reset(self):
+        n = self.cells
+        start = (n // 3, n // 3)
+        self.snake = deque([start])
+        self.occupied = set()
+        self.free = [(x, y) for x in range(n) for y in range(n)]
+        self.free_index = {cell: i for i, cell in enumerate(self.free)}
+        self._occupy(start)
+        self.apple = (n // 2, n // 2)
+        self.direction = (0, 0)
+        self.score = 0
+        self.over = False
+        self.steps = 0
+
+    def _occupy(self, cell):
+        self.occupied.add(cell)
+        i = self.free_index.pop(cell)
+        last = self.free.pop()
+        if last != cell:
+            self.free[i] = last
+            self.free_index[last] = i
+
+    def _release(self, cell):
+        self.occupied.discard(cell)
+        self.free_index[cell] = len(self.free)
+        self.free.append(cell)
+
+    def spawn_apple(self):
+        return self.rng.choice(self.free) if self.free else None
+
+    def turn(self, direction):
+        # Ignores reversing onto the snake's own neck
+        dx, dy = self.direction
+        if (direction[0] == 0 and dy == 0) or (direction[1] == 0 and dx == 0):
+            self.direction = direction
+
+    def next_head(self, direction=None):
+        dx, dy = direction or self.direction
+        head = self.snake[0]
+        return ((head[0] + dx) % self.cells, (head[1] + dy) % self.cells)
+
+    def step(self):
+        # Advance one tick.  Returns (old head, removed tail or None when the
+        # snake grew), or None if nothing moved.
+        if self.over or self.direction == (0, 0):
+            return None
+        head = self.snake[0]
+        new_head = self.next_head()
+        if new_head in self.occupied:
+            self.over = True
+            return None
+        self.snake.appendleft(new_head)
+        self._occupy(new_head)
+        self.steps += 1
+        if new_head == self.apple:
+            self.score += 1
+            self.apple = self.spawn_apple()
+            if self.apple is None:
+                self.over = True  # the snake fills the board
+            return head, None
+        tail = self.snake.pop()
+        self._release(tail)
+        return head, tail
+
+def snake_random_policy(game, rng):
+    return rng.choice(DIRECTIONS)
+
+def snake_greedy_policy(game, rng):
+    # Head for the apple along a safe direction, else any safe direction
+    safe = [d for d in DIRECTIONS if game.next_head(d) not in game.occupied]
+    if not safe:
+        return game.direction
+    if game.apple is not None:
+        def distance(d):
+            x, y = game.next_head(d)
+            dx = abs(x - game.apple[0])
+            dy = abs(y - game.apple[1])
+            return min(dx, game.cells - dx) + min(dy, game.cells - dy)
+        return min(safe, key=distance)
+    return rng.choice(safe)
+
+SNAKE_POLICIES = {"random": snake_random_policy, "greedy": snake_greedy_policy}
@@ -1,4 +1,14 @@
 # main.py
+import time
+
+_START = time.perf_counter()  # for the startup report
+
+# These stay at module level on purpose.  Screen and Widget are base
+# classes of the screens below; the dashboard's kv rule creates Label,
+# Button and GridLayout (and Factory imports them) before the first
+# frame; kivy.graphics is already loaded by Widget.  Only the image
+# modules, which nothing on the dashboard uses, are imported lazily in
+# the chess screen.
 from kivy.app import App
 from kivy.lang import Builder
 from kivy.uix.screenmanager import ScreenManager, Screen
@@ -7,69 +17,17 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Rectangle
+from kivy.graphics import Color, InstructionGroup, Rectangle
 from kivy.clock import Clock
 from kivy.core.window import Window
-import random
-import math
-
-# =====================================================
-# TIC TAC TOE ENGINE
-# =====================================================
-
-def available_moves(board):
-    return [i for i, x in enumerate(board) if x == ""]
-
-def check_winner(board):
-    wins = [(0,1,2), (3,4,5), (6,7,8),
-            (0,3,6), (1,4,7), (2,5,8),
-            (0,4,8), (2,4,6)]
-    for a, b, c in wins:
-        if board[a] != "" and board[a] == board[b] == board[c]:
-            return board[a]
-    if "" not in board:
-        return "draw"
-    return None
-
-def minimax(board, player):
-    winner = check_winner(board)
-    if winner == "X":
-        return {"score": -1}
-    elif winner == "O":
-        return {"score": 1}
-    elif winner == "draw":
-        return {"score": 0}
-
-    moves = []
-    for idx in available_moves(board):
-        move = {}
-        move["index"] = idx
-        board[idx] = player
-        if player == "O":
-            result = minimax(board, "X")
-            move["score"] = result["score"]
-        else:
-            result = minimax(board, "O")
-            move["score"] = result["score"]
-        board[idx] = ""
-        moves.append(move)
-
-    if player == "O":
-        best_score = -math.inf
-        best_move = None
-        for m in moves:
-            if m["score"] > best_score:
-                best_score = m["score"]
-                best_move = m
-        return best_move
-    else:
-        best_score = math.inf
-        best_move = None
-        for m in moves:
-            if m["score"] < best_score:
-                best_score = m["score"]
-                best_move = m
-        return best_move
+from kivy.logger import Logger
+from kivy.properties import NumericProperty
+from tictactoe_engine import TicTacToeClient
+from game_models import ChessGame, SnakeGame, TicTacToeGame
+from game_loop import GameLoop
+import os
+import threading
+from collections import deque
 
 # =====================================================
 # TIC TAC TOE SCREEN
@@ -78,9 +36,10 @@ def minimax(board, player):
 class TicTacToeScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.board = [""]*9
-        self.current = "X"
-        self.game_over = False
+        self.game = TicTacToeGame()
+        self.thinking = False  # an AI move is being computed
+        self._ai_turn = 0      # bumped to discard a pending AI move
+        self.ai = TicTacToeClient()
 
         root = BoxLayout(orientation='vertical', spacing=8, padding=12)
         
@@ -135,79 +94,122 @@ class TicTacToeScreen(Screen):
         self.bg_rect.size = instance.size
 
     def on_click(self, idx):
-        if self.board[idx] != "" or self.game_over:
+        if self.thinking:
+            return
+        if not self.game.over and self.game.to_move() == "O":
+            self._start_ai()  # retry after a failed AI move
+            return
+        if not self.game.play(idx, "X"):
             return
         
-        self.board[idx] = "X"
         self.buttons[idx].text = "X"
         self.buttons[idx].color = (0.3, 0.6, 1, 1)
 
-        winner = check_winner(self.board)
-        if winner:
-            self.status.text = f"Game over: {winner} wins!" if winner != "draw" else "Draw!"
-            self.game_over = True
+        if self._check_game_over():
             return
 
-        result = minimax(self.board.copy(), "O")
-        if result is None:
-            self.status.text = "Draw!"
-            self.game_over = True
+        self._start_ai()
+
+    def _start_ai(self):
+        self.thinking = True
+        self.status.text = "Thinking..."
+        turn = self._ai_turn
+        threading.Thread(target=self._think, args=(list(self.game.board), turn), daemon=True).start()
+
+    def _think(self, board, turn):
+        # Worker thread: hand the move, or the failure, back to the UI thread
+        try:
+            ai_index, error = self.ai.ai_move(board, "O"), None
+        except Exception as exc:
+            ai_index, error = None, exc
+        Clock.schedule_once(lambda dt: self._apply_ai_move(turn, ai_index, error))
+
+    def _apply_ai_move(self, turn, ai_index, error=None):
+        if turn != self._ai_turn:
+            return  # reset or left the screen while thinking
+        self.thinking = False
+        if error is not None or ai_index not in range(9) or not self.game.play(ai_index, "O"):
+            # The game isn't over: it is still O's turn, and the next tap
+            # on the board (or re-entering the screen) asks the AI again.
+            Logger.warning("TicTacToe: AI move failed: %s", error or "unplayable move %r" % ai_index)
+            self.status.text = "AI move failed - tap the board to retry"
+            return
+
+        self.buttons[ai_index].text = "O"
+        self.buttons[ai_index].color = (1, 0.3, 0.3, 1)
+
+        if self._check_game_over():
             return
-        
-        ai_index = result.get("index")
-        if ai_index is not None:
-            self.board[ai_index] = "O"
-            self.buttons[ai_index].text = "O"
-            self.buttons[ai_index].color = (1, 0.3, 0.3, 1)
-
-            winner = check_winner(self.board)
-            if winner:
-                self.status.text = f"Game over: {winner} wins!" if winner != "draw" else "Draw!"
-                self.game_over = True
-                return
 
         self.status.text = "Your turn (X)"
 
+    def _check_game_over(self):
+        winner = self.game.winner
+        if winner:
+            self.status.text = f"Game over: {winner} wins!" if winner != "draw" else "Draw!"
+        return bool(winner)
+
+    def cancel_ai(self):
+        self._ai_turn += 1
+        self.thinking = False
+
+    def on_leave(self, *args):
+        self.cancel_ai()
+
+    def on_enter(self, *args):
+        if not self.game.over and self.game.to_move() == "O":
+            self._start_ai()
+
     def reset(self):
-        self.board = [""]*9
+        self.cancel_ai()
+        self.game.reset()
         for b in self.buttons:
             b.text = ""
             b.color = (1, 1, 1, 1)
         self.status.text = "Your turn (X)"
-        self.game_over = False
 
 # =====================================================
 # CHESS SCREEN
 # =====================================================
 
-from kivy.uix.image import Image
-import os
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+
+# Image mappings for chess pieces
+PIECE_IMAGES = {
+    '♔': 'white_king.png',
+    '♕': 'white_queen.png',
+    '♖': 'white_rook.png',
+    '♗': 'white_bishop.png',
+    '♘': 'white_horse.png',
+    'a': 'white_pawn.png',
+    '♚': 'black_king.png',
+    '♛': 'black_queen.png',
+    '♜': 'black_rook.png',
+    '♝': 'black_bishop.png',
+    '♞': 'black_horse.png',
+    '1': 'black_pawn.png',
+}
+
+LIGHT_SQUARE = (0.9, 0.8, 0.6, 1)
+DARK_SQUARE = (0.6, 0.4, 0.2, 1)
+SELECTED_SQUARE = (0.3, 0.8, 0.3, 1)
+
+# piece -> texture (None if its image is missing), shared by every square
+_piece_textures = {}
+
+def piece_texture(piece):
+    if piece not in _piece_textures:
+        from kivy.core.image import Image as CoreImage
+        path = os.path.join(IMAGES_DIR, PIECE_IMAGES[piece])
+        _piece_textures[piece] = CoreImage(path).texture if os.path.exists(path) else None
+    return _piece_textures[piece]
 
 class ChessScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.board = self.create_initial_board()
+        self.game = ChessGame()
         self.selected = None
-        self.white_turn = True
-        
-        # Image mappings for chess pieces
-        self.piece_images = {
-            '♔': 'images/white_king.png',
-            '♕': 'images/white_queen.png',
-            '♖': 'images/white_rook.png',
-            '♗': 'images/white_bishop.png',
-            '♘': 'images/white_knight.png',
-            'a': 'D:/VS Code/Minor_Project2/frontend/images/white_pawn.png',
-            '♚': 'images/black_king.png',
-            '♛': 'images/black_queen.png',
-            '♜': 'images/black_rook.png',
-            '♝': 'images/black_bishop.png',
-            '♞': 'images/black_knight.png',
-            '1': 'images/black_pawn.png',
-        }
-        
-        # Check if images directory exists
-        self.use_images = os.path.exists('images')
+        self.shown = [[None] * 8 for _ in range(8)]  # piece each square displays
 
         root = BoxLayout(orientation='vertical', spacing=6, padding=8)
         
@@ -226,6 +228,7 @@ class ChessScreen(Screen):
 
         self.grid = GridLayout(cols=8, spacing=1, size_hint=(1, 0.84))
         self.buttons = []
+        self.build_squares()
         self.draw_board()
         root.add_widget(self.grid)
 
@@ -251,105 +254,80 @@ class ChessScreen(Screen):
         self.bg_rect.pos = instance.pos
         self.bg_rect.size = instance.size
 
-    def create_initial_board(self):
-        return [
-            ['♜', '♞', '♝', '♛', '♚', '♝', '♞', '♜'],
-            ['1', '1', '1', '1', '1', '1', '1', '1'],
-            ['', '', '', '', '', '', '', ''],
-            ['', '', '', '', '', '', '', ''],
-            ['', '', '', '', '', '', '', ''],
-            ['', '', '', '', '', '', '', ''],
-            ['a', 'a', 'a', 'a', 'a', 'a', 'a', 'a'],
-            ['♖', '♘', '♗', '♕', '♔', '♗', '♘', '♖']
-        ]
-
-    def draw_board(self):
-        self.grid.clear_widgets()
-        self.buttons = []
-        for row_idx, row in enumerate(self.board):
-            for col_idx, cell in enumerate(row):
-                is_light = (row_idx + col_idx) % 2 == 0
-                bg_color = (0.9, 0.8, 0.6, 1) if is_light else (0.6, 0.4, 0.2, 1)
-                
-                # Create button with image or text
-                if self.use_images and cell in self.piece_images:
-                    # Use image if available
-                    btn_layout = BoxLayout()
-                    b = Button(
-                        background_color=bg_color,
-                        background_normal='',
-                    )
-                    
-                    if os.path.exists(self.piece_images[cell]):
-                        img = Image(source=self.piece_images[cell], 
-                                  allow_stretch=True,
-                                  keep_ratio=True)
-                        b.add_widget(img)
-                    else:
-                        # Fallback to text if image not found
-                        b.text = cell
-                        b.font_size = 32
-                        b.color = (0, 0, 0, 1)
-                else:
-                    # Use Unicode text
-                    b = Button(
-                        text=cell, 
-                        font_size=32,
-                        background_color=bg_color,
-                        background_normal='',
-                        color=(0, 0, 0, 1)
-                    )
-                
+    def square_color(self, row, col):
+        if self.selected == (row, col):
+            return SELECTED_SQUARE
+        return LIGHT_SQUARE if (row + col) % 2 == 0 else DARK_SQUARE
+
+    def build_squares(self):
+        # The 64 squares are created once; moves only update the ones that change
+        from kivy.uix.image import Image
+        for row_idx in range(8):
+            for col_idx in range(8):
+                b = Button(
+                    font_size=32,
+                    background_color=self.square_color(row_idx, col_idx),
+                    background_normal='',
+                    color=(0, 0, 0, 1)
+                )
+                img = Image(allow_stretch=True, keep_ratio=True, opacity=0)
+                b.add_widget(img)
+                b.bind(pos=img.setter('pos'), size=img.setter('size'))
+                b.image = img
                 b.row = row_idx
                 b.col = col_idx
                 b.bind(on_release=self.cell_pressed)
                 self.buttons.append(b)
                 self.grid.add_widget(b)
 
-    def is_white_piece(self, piece):
-        return piece in ['f', 'e', 'd', 'c', 'b', 'a']
+    def update_square(self, row, col):
+        b = self.buttons[row * 8 + col]
+        b.background_color = self.square_color(row, col)
+        cell = self.game.board[row][col]
+        if self.shown[row][col] == cell:
+            return
+        self.shown[row][col] = cell
+        texture = piece_texture(cell) if cell in PIECE_IMAGES else None
+        if texture is not None:
+            b.image.texture = texture
+            b.image.opacity = 1
+            b.text = ''
+        else:
+            # Unicode text when there is no image for the piece
+            b.image.opacity = 0
+            b.text = cell
 
-    def is_black_piece(self, piece):
-        return piece in ['6', '5', '4', '3', '2', '1']
+    def draw_board(self):
+        for row_idx in range(8):
+            for col_idx in range(8):
+                self.update_square(row_idx, col_idx)
 
     def cell_pressed(self, btn):
         row = btn.row
         col = btn.col
         
         if self.selected is None:
-            piece = self.board[row][col]
-            if piece != "":
-                if (self.white_turn and self.is_white_piece(piece)) or \
-                   (not self.white_turn and self.is_black_piece(piece)):
-                    self.selected = (row, col)
-                    btn.background_color = (0.3, 0.8, 0.3, 1)
-                    self.status.text = f"Selected {piece} - Choose destination"
+            if self.game.can_select(row, col):
+                self.selected = (row, col)
+                self.update_square(row, col)
+                self.status.text = f"Selected {self.game.board[row][col]} - Choose destination"
         else:
-            src_row, src_col = self.selected
-            piece = self.board[src_row][src_col]
-            dest_piece = self.board[row][col]
-            
-            can_move = True
-            if dest_piece != "":
-                if (self.white_turn and self.is_white_piece(dest_piece)) or \
-                   (not self.white_turn and self.is_black_piece(dest_piece)):
-                    can_move = False
-            
-            if can_move:
-                self.board[row][col] = piece
-                self.board[src_row][src_col] = ''
-                self.white_turn = not self.white_turn
-                self.status.text = f"{'White' if self.white_turn else 'Black'}'s turn"
+            src = self.selected
+            if self.game.move(src, (row, col)):
+                if self.game.over:
+                    self.status.text = f"Game over: {self.game.winner.capitalize()} wins!"
+                else:
+                    self.status.text = f"{'White' if self.game.white_turn else 'Black'}'s turn"
             else:
                 self.status.text = "Invalid move - try again"
             
             self.selected = None
-            self.draw_board()
+            self.update_square(*src)
+            self.update_square(row, col)
 
     def reset_board(self):
-        self.board = self.create_initial_board()
+        self.game.reset()
         self.selected = None
-        self.white_turn = True
         self.status.text = "White's turn - Select a piece"
         self.draw_board()
 
@@ -357,86 +335,121 @@ class ChessScreen(Screen):
 # SNAKE GAME
 # =====================================================
 
+SNAKE_CELLS = int(os.environ.get("SNAKE_CELLS", "30"))
+KEY_DIRECTIONS = {'up': (0, 1), 'down': (0, -1), 'left': (-1, 0), 'right': (1, 0)}
+
 class SnakeWidget(Widget):
+    # Board is cells x cells; changing it restarts the game
+    cells = NumericProperty(30)
+    game = None
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.grid_size = 20
-        self.snake = [(10, 10)]
-        self.direction = (0, 0)
-        self.apple = (15, 15)
-        self.score = 0
-        self.game_over = False
-        
+        self.game = SnakeGame(self.cells)
+
+        # Canvas instructions live as long as the widget: a step moves the
+        # tail rectangle to the new head (or adds one when eating) and moves
+        # the apple, so a frame costs the same whatever the snake's length.
+        self.cell_size = 0
+        self.offset = (0, 0)
+        self.segment_rects = deque()  # parallel to game.snake, head first
+        self.body = InstructionGroup()
         with self.canvas:
             Color(0, 0, 0, 1)
             self.bg_rect = Rectangle(pos=self.pos, size=self.size)
+            Color(0, 1, 0, 1)
+        self.canvas.add(self.body)
+        with self.canvas:
+            Color(1, 0, 0, 1)
+            self.apple_rect = Rectangle()
         
         self.bind(pos=self._update_rect, size=self._update_rect)
-        self.draw()
+        self.reset()
+
+    def on_cells(self, instance, value):
+        if self.game is None:
+            return  # set from kwargs, __init__ hasn't finished
+        self.game = SnakeGame(value)
+        self._update_rect()
+        self.reset()
 
     def _update_rect(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
+        self.cell_size = self.get_cell_size()
+        self.offset = (self.x + (self.width - self.cells * self.cell_size) / 2,
+                       self.y + (self.height - self.cells * self.cell_size) / 2)
         self.draw()
 
     def get_cell_size(self):
-        return min(self.width, self.height) / 30
+        return min(self.width, self.height) / self.cells
+
+    def cell_pos(self, cell):
+        return (self.offset[0] + cell[0] * self.cell_size,
+                self.offset[1] + cell[1] * self.cell_size)
 
     def draw(self):
-        self.canvas.clear()
-        with self.canvas:
-            Color(0, 0, 0, 1)
-            Rectangle(pos=self.pos, size=self.size)
-            
-            cell_size = self.get_cell_size()
-            offset_x = self.x + (self.width - 30 * cell_size) / 2
-            offset_y = self.y + (self.height - 30 * cell_size) / 2
-            
-            Color(0, 1, 0, 1)
-            for segment in self.snake:
-                Rectangle(
-                    pos=(offset_x + segment[0] * cell_size, 
-                         offset_y + segment[1] * cell_size),
-                    size=(cell_size - 1, cell_size - 1)
-                )
-            
-            Color(1, 0, 0, 1)
-            Rectangle(
-                pos=(offset_x + self.apple[0] * cell_size, 
-                     offset_y + self.apple[1] * cell_size),
-                size=(cell_size - 1, cell_size - 1)
-            )
+        # Full sync of the instructions with the game state; only needed
+        # after a resize or reset, move() updates them incrementally.
+        snake = self.game.snake
+        size = (self.cell_size - 1, self.cell_size - 1)
+        while len(self.segment_rects) < len(snake):
+            rect = Rectangle()
+            self.body.add(rect)
+            self.segment_rects.append(rect)
+        while len(self.segment_rects) > len(snake):
+            self.body.remove(self.segment_rects.pop())
+        for rect, segment in zip(self.segment_rects, snake):
+            rect.pos = self.cell_pos(segment)
+            rect.size = size
+        self._draw_apple()
+
+    def _draw_apple(self):
+        if self.game.apple is None:
+            self.apple_rect.size = (0, 0)
+        else:
+            self.apple_rect.pos = self.cell_pos(self.game.apple)
+            self.apple_rect.size = (self.cell_size - 1, self.cell_size - 1)
 
     def move(self):
-        if self.game_over or self.direction == (0, 0):
+        # render() leaves the head and tail part-way between cells; put them
+        # back on the grid before the head rectangle becomes the neck.
+        snake = self.game.snake
+        self.segment_rects[0].pos = self.cell_pos(snake[0])
+        self.segment_rects[-1].pos = self.cell_pos(snake[-1])
+        moved = self.game.step()
+        if moved is None:
             return
-        
-        head = self.snake[0]
-        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
-        new_head = (new_head[0] % 30, new_head[1] % 30)
-        
-        if new_head in self.snake:
-            self.game_over = True
-            return
-        
-        self.snake.insert(0, new_head)
-        
-        if new_head == self.apple:
-            self.score += 1
-            self.apple = (random.randint(0, 29), random.randint(0, 29))
-            while self.apple in self.snake:
-                self.apple = (random.randint(0, 29), random.randint(0, 29))
+        self._head_from, self._tail_from = moved
+        if self._tail_from is None:
+            rect = Rectangle(size=(self.cell_size - 1, self.cell_size - 1))
+            self.body.add(rect)
+            self._draw_apple()
         else:
-            self.snake.pop()
-        
-        self.draw()
+            rect = self.segment_rects.pop()
+        rect.pos = self.cell_pos(self.game.snake[0])
+        self.segment_rects.appendleft(rect)
+
+    def render(self, alpha):
+        # Slide the head and tail between cells; alpha is how far into the
+        # next tick we are.  Everything else stays where move() put it.
+        if self._head_from is None or self.game.over:
+            return
+        snake = self.game.snake
+        self.segment_rects[0].pos = self._lerp(self._head_from, snake[0], alpha)
+        if self._tail_from is not None:
+            self.segment_rects[-1].pos = self._lerp(self._tail_from, snake[-1], alpha)
+
+    def _lerp(self, a, b, alpha):
+        if abs(a[0] - b[0]) > 1 or abs(a[1] - b[1]) > 1:
+            return self.cell_pos(b)  # wrapped around the edge
+        ax, ay = self.cell_pos(a)
+        bx, by = self.cell_pos(b)
+        return (ax + (bx - ax) * alpha, ay + (by - ay) * alpha)
 
     def reset(self):
-        self.snake = [(10, 10)]
-        self.direction = (0, 0)
-        self.apple = (15, 15)
-        self.score = 0
-        self.game_over = False
+        self.game.reset()
+        self._head_from = self._tail_from = None
         self.draw()
 
 
@@ -459,7 +472,7 @@ class SnakeScreen(Screen):
         )
         root.add_widget(self.status)
 
-        self.snake_widget = SnakeWidget(size_hint=(1, 0.75))
+        self.snake_widget = SnakeWidget(cells=SNAKE_CELLS, size_hint=(1, 0.75))
         root.add_widget(self.snake_widget)
 
         ctrl = BoxLayout(size_hint=(1, 0.15), spacing=8)
@@ -479,65 +492,58 @@ class SnakeScreen(Screen):
         ctrl.add_widget(back)
         root.add_widget(ctrl)
 
+        self.loop = GameLoop(self.update_game, self.snake_widget.render, step=0.15, name="snake")
+        if self.loop.overlay is not None:
+            root.add_widget(self.loop.overlay, index=len(root.children))
+
         self.add_widget(root)
-        
-        self.game_event = None
-        self._keyboard = Window.request_keyboard(self._keyboard_closed, self)
-        self._keyboard.bind(on_key_down=self._on_keyboard_down)
+        self._keyboard = None
 
     def _update_rect(self, instance, value):
         self.bg_rect.pos = instance.pos
         self.bg_rect.size = instance.size
 
     def _keyboard_closed(self):
-        self._keyboard.unbind(on_key_down=self._on_keyboard_down)
-        self._keyboard = None
+        if self._keyboard is not None:
+            self._keyboard.unbind(on_key_down=self._on_keyboard_down)
+            self._keyboard = None
 
     def _on_keyboard_down(self, keyboard, keycode, text, modifiers):
-        key = keycode[1]
-        dx, dy = self.snake_widget.direction
-        
-        if key == 'up' and dy == 0:
-            self.snake_widget.direction = (0, 1)
-        elif key == 'down' and dy == 0:
-            self.snake_widget.direction = (0, -1)
-        elif key == 'left' and dx == 0:
-            self.snake_widget.direction = (-1, 0)
-        elif key == 'right' and dx == 0:
-            self.snake_widget.direction = (1, 0)
-        
+        direction = KEY_DIRECTIONS.get(keycode[1])
+        if direction:
+            self.snake_widget.game.turn(direction)
         return True
 
     def on_enter(self):
-        if self.game_event:
-            self.game_event.cancel()
-        self.game_event = Clock.schedule_interval(self.update_game, 0.15)
+        # The keyboard is only held while the snake screen is showing
+        if self._keyboard is None:
+            self._keyboard = Window.request_keyboard(self._keyboard_closed, self)
+            self._keyboard.bind(on_key_down=self._on_keyboard_down)
+        if not self.snake_widget.game.over:
+            self.loop.start()
 
     def on_leave(self):
-        if self.game_event:
-            self.game_event.cancel()
-            self.game_event = None
+        self.loop.stop()
+        if self._keyboard is not None:
+            keyboard = self._keyboard
+            self._keyboard_closed()
+            keyboard.release()
 
     def update_game(self, dt):
         self.snake_widget.move()
-        if self.snake_widget.game_over:
-            self.status.text = f"Game Over! Final Score: {self.snake_widget.score}"
-            if self.game_event:
-                self.game_event.cancel()
+        if self.snake_widget.game.over:
+            self.status.text = f"Game Over! Final Score: {self.snake_widget.game.score}"
+            self.loop.stop()
         else:
-            self.status.text = f"Score: {self.snake_widget.score} | Use Arrow Keys"
+            self.status.text = f"Score: {self.snake_widget.game.score} | Use Arrow Keys"
 
     def reset_game(self):
         self.snake_widget.reset()
         self.status.text = "Score: 0 | Use Arrow Keys"
-        if self.game_event:
-            self.game_event.cancel()
-        self.game_event = Clock.schedule_interval(self.update_game, 0.15)
+        self.loop.start()
 
     def go_back(self, instance):
-        if self.game_event:
-            self.game_event.cancel()
-            self.game_event = None
+        self.loop.stop()
         self.manager.current = 'dashboard'
 
 # =====================================================
@@ -598,8 +604,38 @@ Builder.load_string('''
 class Dashboard(Screen):
     pass
 
+# Screens are built the first time they are shown (or prewarmed one per
+# frame once the dashboard is up), so startup only pays for the dashboard.
+# PREWARM_SCREENS=0 turns prewarming off.
+SCREENS = {
+    "tic_tac_toe": lambda: TicTacToeScreen(name="tic_tac_toe"),
+    "chess": lambda: ChessScreen(name="chess"),
+    "snake": lambda: SnakeScreen(name="snake"),
+}
+PREWARM_SCREENS = os.environ.get("PREWARM_SCREENS", "1") == "1"
+
 class GameManager(ScreenManager):
-    pass
+    def ensure_screen(self, name):
+        if name in SCREENS and not self.has_screen(name):
+            t0 = time.perf_counter()
+            self.add_widget(SCREENS[name]())
+            Logger.info("Startup: built screen %s in %.1f ms", name, (time.perf_counter() - t0) * 1000)
+
+    def on_current(self, instance, value):
+        self.ensure_screen(value)
+        super().on_current(instance, value)
+
+    def prewarm(self, names=None):
+        # Build the remaining screens one per frame so the UI never stalls
+        pending = [n for n in (names or SCREENS) if not self.has_screen(n)]
+        def build_next(dt):
+            if pending:
+                self.ensure_screen(pending.pop(0))
+                Clock.schedule_once(build_next)
+        Clock.schedule_once(build_next)
+        # The tic-tac-toe solution table is built on first use; do it now
+        from tictactoe_engine import get_table
+        threading.Thread(target=get_table, daemon=True).start()
 
 # =====================================================
 # MAIN APPLICATION
@@ -607,12 +643,25 @@ class GameManager(ScreenManager):
 
 class MiniGamesApp(App):
     def build(self):
+        self._build_start = time.perf_counter()
         sm = GameManager()
         sm.add_widget(Dashboard(name="dashboard"))
-        sm.add_widget(TicTacToeScreen(name="tic_tac_toe"))
-        sm.add_widget(ChessScreen(name="chess"))
-        sm.add_widget(SnakeScreen(name="snake"))
+        self._build_end = time.perf_counter()
         return sm
 
+    def on_start(self):
+        Window.bind(on_flip=self._first_frame)
+
+    def _first_frame(self, *args):
+        # Cold start to the first frame on screen, reported once
+        Window.unbind(on_flip=self._first_frame)
+        now = time.perf_counter()
+        Logger.info("Startup: imports %.1f ms, build %.1f ms, first frame at %.1f ms",
+                    (self._build_start - _START) * 1000,
+                    (self._build_end - self._build_start) * 1000,
+                    (now - _START) * 1000)
+        if PREWARM_SCREENS:
+            self.root.prewarm()
+
 if __name__ == "__main__":
     MiniGamesApp().run()
\ No newline at end of file
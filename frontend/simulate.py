@@ -0,0 +1,120 @@
+# simulate.py
+# Plays the mini-games headless (no window, no Kivy) across a process pool,
+# for load testing and for regression testing the AI.  Games are split into
+# seeded chunks, so a run with the same arguments plays the same games.
+#
+#   python simulate.py tictactoe --games 100000 --x random --o ai --check
+#   python simulate.py snake --games 2000 --policy greedy --cells 40
+#   python simulate.py chess --games 5000 --white capture --black random
+#
+# --check exits non-zero if an "ai" tic-tac-toe side ever loses.
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from game_models import (CHESS_POLICIES, SNAKE_POLICIES, TTT_POLICIES, ChessGame,
+                         SnakeGame, TicTacToeGame)
+
+SEED = 1234
+CHUNK = 500  # games per task sent to a worker
+
+def play_tictactoe(rng, x="random", o="ai"):
+    game = TicTacToeGame()
+    policies = {"X": TTT_POLICIES[x], "O": TTT_POLICIES[o]}
+    while not game.over:
+        player = game.to_move()
+        game.play(policies[player](game, rng), player)
+    return game.winner, 9 - game.board.count("")
+
+def play_chess(rng, white="random", black="random", max_plies=200):
+    game = ChessGame()
+    policies = {True: CHESS_POLICIES[white], False: CHESS_POLICIES[black]}
+    while not game.over and game.plies < max_plies:
+        game.move(*policies[game.white_turn](game, rng))
+    return game.winner or "draw", game.plies
+
+def play_snake(rng, policy="greedy", cells=30, max_steps=10000):
+    game = SnakeGame(cells, rng)
+    choose = SNAKE_POLICIES[policy]
+    while not game.over and game.steps < max_steps:
+        game.turn(choose(game, rng))
+        if game.step() is None and not game.over:
+            break  # the policy stopped moving
+    return ("full" if game.apple is None else "crashed" if game.over else "timeout"), game.score
+
+GAMES = {"tictactoe": play_tictactoe, "chess": play_chess, "snake": play_snake}
+
+def run_chunk(name, seed, count, options):
+    # One worker task: returns (outcome counts, sum of per-game values)
+    rng = random.Random(seed)
+    play = GAMES[name]
+    outcomes = Counter()
+    total = 0
+    for _ in range(count):
+        outcome, value = play(rng, **options)
+        outcomes[outcome] += 1
+        total += value
+    return outcomes, total
+
+def simulate(name, games, workers, seed=SEED, **options):
+    chunks = [min(CHUNK, games - start) for start in range(0, games, CHUNK)]
+    outcomes = Counter()
+    total = 0
+    start = time.perf_counter()
+    if workers <= 1:
+        results = [run_chunk(name, seed + i, n, options) for i, n in enumerate(chunks)]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(run_chunk, name, seed + i, n, options)
+                       for i, n in enumerate(chunks)]
+            results = [f.result() for f in futures]
+    for chunk_outcomes, chunk_total in results:
+        outcomes.update(chunk_outcomes)
+        total += chunk_total
+    return outcomes, total, time.perf_counter() - start
+
+VALUE_LABEL = {"tictactoe": "avg moves", "chess": "avg plies", "snake": "avg score"}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("game", choices=sorted(GAMES))
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--x", choices=sorted(TTT_POLICIES), default="random")
+    parser.add_argument("--o", choices=sorted(TTT_POLICIES), default="ai")
+    parser.add_argument("--white", choices=sorted(CHESS_POLICIES), default="random")
+    parser.add_argument("--black", choices=sorted(CHESS_POLICIES), default="random")
+    parser.add_argument("--policy", choices=sorted(SNAKE_POLICIES), default="greedy")
+    parser.add_argument("--cells", type=int, default=30, help="snake board size")
+    parser.add_argument("--check", action="store_true",
+                        help="fail if an 'ai' tic-tac-toe side loses a game")
+    args = parser.parse_args()
+
+    options = {
+        "tictactoe": {"x": args.x, "o": args.o},
+        "chess": {"white": args.white, "black": args.black},
+        "snake": {"policy": args.policy, "cells": args.cells},
+    }[args.game]
+    outcomes, total, seconds = simulate(args.game, args.games, args.workers, args.seed, **options)
+
+    print("%s: %d games in %.2fs on %d workers, %.1f games/sec" % (
+        args.game, args.games, seconds, args.workers, args.games / seconds))
+    for outcome, count in outcomes.most_common():
+        print("  %-8s %8d  %5.1f%%" % (outcome, count, 100.0 * count / args.games))
+    print("  %s: %.2f" % (VALUE_LABEL[args.game], total / args.games))
+
+    if args.check and args.game == "tictactoe":
+        losses = sum(outcomes[side] for side, other in (("X", args.o), ("O", args.x))
+                     if other == "ai")
+        if losses:
+            print("FAIL: the AI lost %d games" % losses)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,15 @@
 # tic_tac_toe.py
+import threading
+
 from kivy.uix.screenmanager import Screen
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.graphics import Color, Rectangle
-from tictactoe_engine import minimax, check_winner
+from kivy.clock import Clock
+from kivy.logger import Logger
+from tictactoe_engine import TicTacToeClient, check_winner
 
 class TicTacToeScreen(Screen):
     def __init__(self, **kwargs):
@@ -13,6 +17,9 @@ class TicTacToeScreen(Screen):
         self.board = [""]*9
         self.current = "X"  # human is X, AI is O
         self.game_over = False
+        self.thinking = False  # an AI move is being computed
+        self._ai_turn = 0      # bumped to discard a pending AI move
+        self.ai = TicTacToeClient()  # local or remote, see TTT_AI_MODE
 
         root = BoxLayout(orientation='vertical', spacing=8, padding=12)
         
@@ -68,7 +75,12 @@ class TicTacToeScreen(Screen):
         self.bg_rect.size = instance.size
 
     def on_click(self, idx):
-        if self.board[idx] != "" or self.game_over:
+        if self.game_over or self.thinking:
+            return
+        if self.board.count("X") > self.board.count("O"):
+            self._start_ai()  # retry after a failed AI move
+            return
+        if self.board[idx] != "":
             return
         
         # Player's move
@@ -77,35 +89,68 @@ class TicTacToeScreen(Screen):
         self.buttons[idx].color = (0.3, 0.6, 1, 1)
 
         # Check if player won
+        if self._check_game_over():
+            return
+
+        # AI's turn, computed off the UI thread so the screen keeps drawing
+        self._start_ai()
+
+    def _start_ai(self):
+        self.thinking = True
+        self.status.text = "Thinking..."
+        turn = self._ai_turn
+        threading.Thread(target=self._think, args=(list(self.board), turn), daemon=True).start()
+
+    def _think(self, board, turn):
+        # Worker thread: no widget access here, hand the result back to the UI thread
+        try:
+            ai_index, error = self.ai.ai_move(board, "O"), None
+        except Exception as exc:
+            ai_index, error = None, exc
+        Clock.schedule_once(lambda dt: self._apply_ai_move(turn, ai_index, error))
+
+    def _apply_ai_move(self, turn, ai_index, error=None):
+        if turn != self._ai_turn:
+            return  # reset or left the screen while thinking
+        self.thinking = False
+        if error is not None or ai_index not in range(9) or self.board[ai_index] != "":
+            # The game isn't over: it is still O's turn, and the next tap
+            # on the board (or re-entering the screen) asks the AI again.
+            Logger.warning("TicTacToe: AI move failed: %s", error or "unplayable move %r" % ai_index)
+            self.status.text = "AI move failed - tap the board to retry"
+            return
+
+        self.board[ai_index] = "O"
+        self.buttons[ai_index].text = "O"
+        self.buttons[ai_index].color = (1, 0.3, 0.3, 1)
+
+        # Check if AI won
+        if self._check_game_over():
+            return
+
+        self.status.text = "Your turn (X)"
+
+    def _check_game_over(self):
         winner = check_winner(self.board)
         if winner:
             self.status.text = f"Game over: {winner} wins!" if winner != "draw" else "Draw!"
             self.game_over = True
-            return
+        return bool(winner)
 
-        # AI's turn
-        result = minimax(self.board.copy(), "O")
-        if result is None:
-            self.status.text = "Draw!"
-            self.game_over = True
-            return
-        
-        ai_index = result.get("index")
-        if ai_index is not None:
-            self.board[ai_index] = "O"
-            self.buttons[ai_index].text = "O"
-            self.buttons[ai_index].color = (1, 0.3, 0.3, 1)
-
-            # Check if AI won
-            winner = check_winner(self.board)
-            if winner:
-                self.status.text = f"Game over: {winner} wins!" if winner != "draw" else "Draw!"
-                self.game_over = True
-                return
+    def cancel_ai(self):
+        self._ai_turn += 1
+        self.thinking = False
 
-        self.status.text = "Your turn (X)"
+    def on_leave(self, *args):
+        self.cancel_ai()
+
+    def on_enter(self, *args):
+        # Resume an AI move that was cancelled by leaving the screen
+        if not self.game_over and self.board.count("X") > self.board.count("O"):
+            self._start_ai()
 
     def reset(self):
+        self.cancel_ai()
         self.board = [""]*9
         for b in self.buttons:
             b.text = ""
@@ -0,0 +1,13 @@
+# tictactoe_engine
+# Tic-tac-toe engine shared by the Flask backend and the Kivy frontend.
+# Install from the repository root with `pip install -e .`.
+from .engine import (
+    WINS, WIN_MASKS, FULL_MASK, BitBoard, bb_winner, bb_minimax, bb_alphabeta,
+    available_moves, check_winner, minimax, alphabeta, TranspositionTable,
+    canonical_key, SYMMETRIES,
+    CELL_CODE, CELLS, NUM_CODES, NO_ENTRY, O_TO_MOVE, encode_board, decode_board,
+    player_to_move, build_table, get_table, best_move, best_move_code,
+    NotInTable,
+    MAX_DIM, WIN_SCORE, SearchTimeout, MNKGame, get_game, mnk_search, win_lines,
+)
+from .client import TicTacToeClient
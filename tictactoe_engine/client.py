@@ -0,0 +1,40 @@
+# tictactoe_engine/client.py
+# Picks AI moves either locally (solution table / search in this process)
+# or remotely through the backend's /tictactoe/ai_move endpoint.
+#
+#   TTT_AI_MODE=local|remote   (default: local)
+#   TTT_SERVER_URL=http://127.0.0.1:5000
+import os
+
+from .engine import best_move
+
+DEFAULT_SERVER_URL = "http://127.0.0.1:5000"
+
+class TicTacToeClient:
+    def __init__(self, mode=None, server_url=None, timeout=2.0, fallback=True):
+        self.mode = mode or os.environ.get("TTT_AI_MODE", "local")
+        if self.mode not in ("local", "remote"):
+            raise ValueError("mode must be 'local' or 'remote'")
+        self.server_url = (server_url or os.environ.get("TTT_SERVER_URL", DEFAULT_SERVER_URL)).rstrip("/")
+        self.timeout = timeout
+        # In remote mode, answer locally when the server can't be reached
+        self.fallback = fallback
+
+    def ai_move(self, board, player="O"):
+        # Index of the AI's move, or None when the game is already over.
+        # The server always plays O, so other sides are computed locally.
+        if self.mode == "remote" and player == "O":
+            try:
+                return self._remote_move(board)
+            except Exception:
+                if not self.fallback:
+                    raise
+        move = best_move(board, player)
+        return move["index"] if move else None
+
+    def _remote_move(self, board):
+        import requests  # only needed in remote mode
+        resp = requests.post(self.server_url + "/tictactoe/ai_move",
+                             json={"board": list(board)}, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json().get("ai_index")
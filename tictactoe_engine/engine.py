@@ -0,0 +1,630 @@
+# tictactoe_engine/engine.py
+# Unbeatable Minimax AI for 3x3 Tic Tac Toe, plus a time-limited search
+# for larger m,n,k boards (4x4, 5x5, Gomoku-style).
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+def win_lines(rows, cols, k):
+    # All runs of k cells in a row, column or diagonal on a rows x cols
+    # board, as tuples of cell indices (row-major).
+    lines = []
+    for r in range(rows):
+        for c in range(cols - k + 1):
+            lines.append(tuple(r * cols + c + i for i in range(k)))
+    for c in range(cols):
+        for r in range(rows - k + 1):
+            lines.append(tuple((r + i) * cols + c for i in range(k)))
+    for r in range(rows - k + 1):
+        for c in range(cols - k + 1):
+            lines.append(tuple((r + i) * cols + c + i for i in range(k)))
+    for r in range(rows - k + 1):
+        for c in range(k - 1, cols):
+            lines.append(tuple((r + i) * cols + c - i for i in range(k)))
+    return lines
+
+WINS = win_lines(3, 3, 3)
+
+# ---------------------------------------------------------------
+# Bitboard representation
+# ---------------------------------------------------------------
+# A position is two 9-bit masks, one per player (bit i = cell i).  Win
+# detection is a handful of AND/compare operations against precomputed
+# line masks, and the search below walks free cells by peeling off the
+# lowest set bit, so no lists or dicts are built per node.
+
+WIN_MASKS = tuple((1 << a) | (1 << b) | (1 << c) for a, b, c in WINS)
+FULL_MASK = 0x1FF
+
+# Running count of positions visited by minimax and alphabeta in this
+# process.  It mixes in every thread's searches; to measure one call, pass
+# it a `stats` dict instead.
+nodes_searched = 0
+
+class BitBoard:
+    __slots__ = ("x", "o")
+
+    def __init__(self, x=0, o=0):
+        self.x = x
+        self.o = o
+
+    @classmethod
+    def from_list(cls, board):
+        if len(board) != 9:
+            raise ValueError("board must have 9 cells")
+        x = o = 0
+        for i, cell in enumerate(board):
+            if cell == "X":
+                x |= 1 << i
+            elif cell == "O":
+                o |= 1 << i
+            elif cell != "":
+                raise ValueError("invalid cell %r" % (cell,))
+        return cls(x, o)
+
+    def to_list(self):
+        return ["X" if self.x >> i & 1 else "O" if self.o >> i & 1 else ""
+                for i in range(9)]
+
+    def free(self):
+        return FULL_MASK & ~(self.x | self.o)
+
+    def winner(self):
+        return bb_winner(self.x, self.o)
+
+def bb_winner(x, o):
+    for m in WIN_MASKS:
+        if x & m == m:
+            return "X"
+        if o & m == m:
+            return "O"
+    if x | o == FULL_MASK:
+        return "draw"
+    return None
+
+def _bb_score(x, o, o_to_move, nodes):
+    # Score of the position for O (+1 win, 0 draw, -1 loss) with perfect play.
+    # nodes[0] counts the positions visited.
+    nodes[0] += 1
+    for m in WIN_MASKS:
+        if x & m == m:
+            return -1
+        if o & m == m:
+            return 1
+    free = FULL_MASK & ~(x | o)
+    if not free:
+        return 0
+    if o_to_move:
+        best = -2
+        while free:
+            bit = free & -free
+            free ^= bit
+            s = _bb_score(x, o | bit, False, nodes)
+            if s > best:
+                best = s
+                if best == 1:
+                    break
+    else:
+        best = 2
+        while free:
+            bit = free & -free
+            free ^= bit
+            s = _bb_score(x | bit, o, True, nodes)
+            if s < best:
+                best = s
+                if best == -1:
+                    break
+    return best
+
+def bb_minimax(x, o, player, stats=None):
+    # Returns (index, score); index is None for finished positions.  Moves
+    # are tried in ascending cell order and only a strictly better score
+    # replaces the current best, matching the list-based tie-breaking.
+    # Pass a dict as `stats` to get this call's node count in stats["nodes"].
+    global nodes_searched
+    nodes = [0]
+    if bb_winner(x, o):
+        best_idx, best = None, _bb_score(x, o, player == "O", nodes)
+    else:
+        best_idx, best = _bb_minimax_root(x, o, player, nodes)
+    nodes_searched += nodes[0]
+    if stats is not None:
+        stats["nodes"] = nodes[0]
+    return best_idx, best
+
+def _bb_minimax_root(x, o, player, nodes):
+    free = FULL_MASK & ~(x | o)
+    best_idx = None
+    best = -2 if player == "O" else 2
+    while free:
+        bit = free & -free
+        free ^= bit
+        if player == "O":
+            s = _bb_score(x, o | bit, False, nodes)
+            better = s > best
+        else:
+            s = _bb_score(x | bit, o, True, nodes)
+            better = s < best
+        if better:
+            best = s
+            best_idx = bit.bit_length() - 1
+    return best_idx, best
+
+# ---------------------------------------------------------------
+# List-board API (["", "X", "O", ...]) used by app.py and the frontend
+# ---------------------------------------------------------------
+
+def available_moves(board):
+    free = BitBoard.from_list(board).free()
+    return [i for i in range(9) if free >> i & 1]
+
+def check_winner(board):
+    bb = BitBoard.from_list(board)
+    return bb_winner(bb.x, bb.o)
+
+def minimax(board, player, stats=None):
+    bb = BitBoard.from_list(board)
+    idx, score = bb_minimax(bb.x, bb.o, player, stats)
+    if idx is None:
+        return {"score": score}
+    return {"index": idx, "score": score}
+
+# ---------------------------------------------------------------
+# Alpha-beta search with a symmetry-reduced transposition table
+# ---------------------------------------------------------------
+# The 8 rotations/reflections of a board have the same value, so the
+# transposition table is keyed on the smallest (x << 9 | o) over all of
+# them.  Transforming a mask is a lookup in a 512-entry table per
+# symmetry.  Root moves are still tried in ascending cell order with the
+# window opened at the best score so far, so the chosen move is exactly
+# the one minimax picks.
+
+# SYMMETRIES[s][i] is the cell that moves to cell i under symmetry s.
+SYMMETRIES = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),  # identity
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),  # rotate 90
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),  # rotate 180
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),  # rotate 270
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),  # mirror left/right
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),  # mirror top/bottom
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),  # main diagonal
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),  # anti-diagonal
+)
+
+def _transform_mask(mask, perm):
+    out = 0
+    for i in range(9):
+        if mask >> perm[i] & 1:
+            out |= 1 << i
+    return out
+
+SYM_MASKS = tuple(tuple(_transform_mask(m, perm) for m in range(512))
+                  for perm in SYMMETRIES)
+
+def canonical_key(x, o):
+    best = x << 9 | o
+    for table in SYM_MASKS[1:]:
+        k = table[x] << 9 | table[o]
+        if k < best:
+            best = k
+    return best
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class TranspositionTable:
+    # Bounded LRU map from canonical position to (score, bound flag).  The
+    # default table is shared by every thread that calls alphabeta, so the
+    # LRU bookkeeping is done under a lock.
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, score, flag):
+        with self._lock:
+            self.entries[key] = (score, flag)
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+def _ab_score(x, o, o_to_move, alpha, beta, tt, nodes):
+    # nodes[0] counts the positions visited, as in _bb_score.
+    nodes[0] += 1
+    for m in WIN_MASKS:
+        if x & m == m:
+            return -1
+        if o & m == m:
+            return 1
+    free = FULL_MASK & ~(x | o)
+    if not free:
+        return 0
+
+    key = canonical_key(x, o) << 1 | o_to_move
+    entry = tt.get(key)
+    if entry is not None:
+        score, flag = entry
+        if flag == EXACT:
+            return score
+        if flag == LOWER and score > alpha:
+            alpha = score
+        elif flag == UPPER and score < beta:
+            beta = score
+        if alpha >= beta:
+            return score
+
+    alpha0, beta0 = alpha, beta
+    if o_to_move:
+        best = -2
+        while free:
+            bit = free & -free
+            free ^= bit
+            s = _ab_score(x, o | bit, False, alpha, beta, tt, nodes)
+            if s > best:
+                best = s
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+    else:
+        best = 2
+        while free:
+            bit = free & -free
+            free ^= bit
+            s = _ab_score(x | bit, o, True, alpha, beta, tt, nodes)
+            if s < best:
+                best = s
+                if best < beta:
+                    beta = best
+                    if alpha >= beta:
+                        break
+
+    if best <= alpha0:
+        flag = UPPER
+    elif best >= beta0:
+        flag = LOWER
+    else:
+        flag = EXACT
+    tt.put(key, best, flag)
+    return best
+
+_tt = TranspositionTable()
+
+def bb_alphabeta(x, o, player, tt=None, stats=None):
+    # Same contract as bb_minimax: returns (index, score), and a `stats`
+    # dict gets this call's node count in stats["nodes"].
+    global nodes_searched
+    if tt is None:
+        tt = _tt
+    nodes = [0]
+    if bb_winner(x, o):
+        best_idx, best = None, _bb_score(x, o, player == "O", nodes)
+    else:
+        best_idx, best = _bb_alphabeta_root(x, o, player, tt, nodes)
+    nodes_searched += nodes[0]
+    if stats is not None:
+        stats["nodes"] = nodes[0]
+    return best_idx, best
+
+def _bb_alphabeta_root(x, o, player, tt, nodes):
+    free = FULL_MASK & ~(x | o)
+    best_idx = None
+    if player == "O":
+        best = -2
+        while free:
+            bit = free & -free
+            free ^= bit
+            s = _ab_score(x, o | bit, False, best, 2, tt, nodes)
+            if s > best:
+                best = s
+                best_idx = bit.bit_length() - 1
+    else:
+        best = 2
+        while free:
+            bit = free & -free
+            free ^= bit
+            s = _ab_score(x | bit, o, True, -2, best, tt, nodes)
+            if s < best:
+                best = s
+                best_idx = bit.bit_length() - 1
+    return best_idx, best
+
+def alphabeta(board, player, tt=None, stats=None):
+    bb = BitBoard.from_list(board)
+    idx, score = bb_alphabeta(bb.x, bb.o, player, tt, stats)
+    if idx is None:
+        return {"score": score}
+    return {"index": idx, "score": score}
+
+# ---------------------------------------------------------------
+# Precomputed solution table
+# ---------------------------------------------------------------
+# Every position reachable from the empty board (X moves first) is solved
+# once and stored in a bytearray indexed by the base-3 encoding of the
+# board ("" -> 0, "X" -> 1, "O" -> 2).  Each byte packs the best move in
+# the low 4 bits, score + 1 in the next 2 bits and a side-to-move flag
+# (O_TO_MOVE); 0xFF marks positions that are unreachable or already
+# finished.  Lookups are O(1) and return exactly the move minimax would
+# pick.  The same base-3 code is the packed board format accepted by
+# /tictactoe/ai_moves.
+
+CELL_CODE = {"": 0, "X": 1, "O": 2}
+CELLS = ("", "X", "O")
+POW3 = [3 ** i for i in range(9)]
+NUM_CODES = 3 ** 9
+NO_ENTRY = 0xFF
+O_TO_MOVE = 0x40
+
+_table = None
+
+def encode_board(board):
+    code = 0
+    for i in range(9):
+        code += CELL_CODE[board[i]] * POW3[i]
+    return code
+
+def decode_board(code):
+    return [CELLS[code // POW3[i] % 3] for i in range(9)]
+
+def player_to_move(board):
+    x = board.count("X")
+    o = board.count("O")
+    return "X" if x == o else "O"
+
+def _solve(x, o, player, code, table, seen):
+    if code in seen:
+        return seen[code]
+    winner = bb_winner(x, o)
+    if winner == "X":
+        score = -1
+    elif winner == "O":
+        score = 1
+    elif winner == "draw":
+        score = 0
+    else:
+        best_idx = None
+        best_score = None
+        for idx in range(9):
+            bit = 1 << idx
+            if (x | o) & bit:
+                continue
+            if player == "O":
+                s = _solve(x, o | bit, "X", code + 2 * POW3[idx], table, seen)
+            else:
+                s = _solve(x | bit, o, "O", code + POW3[idx], table, seen)
+            if best_score is None or (s > best_score if player == "O" else s < best_score):
+                best_score = s
+                best_idx = idx
+        score = best_score
+        table[code] = best_idx | ((score + 1) << 4) | (O_TO_MOVE if player == "O" else 0)
+    seen[code] = score
+    return score
+
+def build_table():
+    table = bytearray([NO_ENTRY]) * NUM_CODES
+    _solve(0, 0, "X", 0, table, {})
+    return table
+
+def get_table():
+    global _table
+    if _table is None:
+        _table = build_table()
+    return _table
+
+def _lookup(code, player):
+    entry = get_table()[code]
+    if entry != NO_ENTRY and bool(entry & O_TO_MOVE) == (player == "O"):
+        return {"index": entry & 0x0F, "score": (entry >> 4 & 0x03) - 1}
+    return None
+
+def best_move(board, player="O", stats=None):
+    # Same return shape as minimax: {"index": i, "score": s}, or None when
+    # there is nothing to play.  Falls back to a full search for positions
+    # outside the table (e.g. a board where it is not `player`'s turn).
+    # Pass a dict as `stats` to get stats["source"] ("table" or "search")
+    # and stats["nodes"] for this call.
+    if stats is not None:
+        stats["source"], stats["nodes"] = "table", 0
+    if check_winner(board):
+        return None
+    move = _lookup(encode_board(board), player)
+    if move is not None:
+        return move
+    if stats is not None:
+        stats["source"] = "search"
+    return minimax(list(board), player, stats)
+
+class NotInTable(ValueError):
+    pass
+
+def best_move_code(code, player="O"):
+    # best_move for a packed base-3 board, answered from the table only so
+    # a batch costs one bytearray index per board.  Returns None for a
+    # finished game; raises NotInTable when it isn't `player`'s turn or the
+    # position can't arise in play (best_move searches those instead).
+    if not 0 <= code < NUM_CODES:
+        raise ValueError("board code out of range")
+    move = _lookup(code, player)
+    if move is not None:
+        return move
+    if check_winner(decode_board(code)):
+        return None
+    raise NotInTable("not %s to move in a reachable position" % player)
+
+# ---------------------------------------------------------------
+# Generalized m,n,k boards
+# ---------------------------------------------------------------
+# Exhaustive search stops being practical past 3x3, so larger boards use
+# iterative-deepening negamax with alpha-beta and a line-count heuristic
+# at the horizon.  Each finished iteration records its best move; when
+# the time budget runs out mid-iteration the last finished one is used.
+
+MAX_DIM = 15
+WIN_SCORE = 1000000
+
+class SearchTimeout(Exception):
+    pass
+
+class MNKGame:
+    def __init__(self, rows=3, cols=3, k=3):
+        if not (1 <= rows <= MAX_DIM and 1 <= cols <= MAX_DIM):
+            raise ValueError("board dimensions must be between 1 and %d" % MAX_DIM)
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError("win length does not fit on the board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.size = rows * cols
+        self.full = (1 << self.size) - 1
+        self.lines = tuple(sum(1 << i for i in line) for line in win_lines(rows, cols, k))
+        self.lines_through = tuple(tuple(m for m in self.lines if m >> i & 1)
+                                   for i in range(self.size))
+        # Centre-first move ordering gives alpha-beta much better cutoffs.
+        cr, cc = (rows - 1) / 2, (cols - 1) / 2
+        self.order = tuple(sorted(range(self.size),
+                                  key=lambda i: abs(i // cols - cr) + abs(i % cols - cc)))
+        # Heuristic weight for a line holding n stones of one colour only.
+        self.weights = tuple(0 if n == 0 else 4 ** n for n in range(k + 1))
+
+    def from_list(self, board):
+        if len(board) != self.size:
+            raise ValueError("board must have %d cells" % self.size)
+        x = o = 0
+        for i, cell in enumerate(board):
+            if cell == "X":
+                x |= 1 << i
+            elif cell == "O":
+                o |= 1 << i
+            elif cell != "":
+                raise ValueError("invalid cell %r" % (cell,))
+        return x, o
+
+    def winner(self, x, o):
+        for m in self.lines:
+            if x & m == m:
+                return "X"
+            if o & m == m:
+                return "O"
+        if x | o == self.full:
+            return "draw"
+        return None
+
+    def completes_line(self, mask, cell):
+        for m in self.lines_through[cell]:
+            if mask & m == m:
+                return True
+        return False
+
+    def evaluate(self, me, opp):
+        score = 0
+        weights = self.weights
+        for m in self.lines:
+            a = me & m
+            b = opp & m
+            if a and not b:
+                score += weights[bin(a).count("1")]
+            elif b and not a:
+                score -= weights[bin(b).count("1")]
+        return score
+
+@lru_cache(maxsize=32)
+def get_game(rows=3, cols=3, k=3):
+    return MNKGame(rows, cols, k)
+
+class _MNKSearch:
+    def __init__(self, game, deadline):
+        self.game = game
+        self.deadline = deadline
+        self.nodes = 0
+
+    def negamax(self, me, opp, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 127 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        game = self.game
+        free = game.full & ~(me | opp)
+        if not free:
+            return 0
+        if depth == 0:
+            return game.evaluate(me, opp)
+        best = -WIN_SCORE - 1
+        for cell in game.order:
+            bit = 1 << cell
+            if not free & bit:
+                continue
+            mine = me | bit
+            if game.completes_line(mine, cell):
+                score = WIN_SCORE - ply
+            else:
+                score = -self.negamax(opp, mine, depth - 1, -beta, -alpha, ply + 1)
+            if score > best:
+                best = score
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+        return best
+
+    def root(self, me, opp, depth, first):
+        game = self.game
+        free = game.full & ~(me | opp)
+        cells = [first] + [c for c in game.order if c != first and free >> c & 1]
+        best_cell, best = first, -WIN_SCORE - 1
+        alpha = -WIN_SCORE - 1
+        for cell in cells:
+            mine = me | 1 << cell
+            if game.completes_line(mine, cell):
+                score = WIN_SCORE
+            else:
+                score = -self.negamax(opp, mine, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+            if score > best:
+                best_cell, best = cell, score
+                alpha = best
+        return best_cell, best
+
+def mnk_search(game, x, o, player="O", time_ms=1000, max_depth=None, stats=None):
+    # Returns (index, score, depth): the best move from the deepest fully
+    # searched iteration, its score for `player`, and that depth.  index is
+    # None when the board has no free cells.  Pass a dict as `stats` to get
+    # the node count back in stats["nodes"].
+    me, opp = (o, x) if player == "O" else (x, o)
+    free = game.full & ~(me | opp)
+    if not free:
+        return None, 0, 0
+    search = _MNKSearch(game, time.perf_counter() + time_ms / 1000.0)
+    best_cell = next(c for c in game.order if free >> c & 1)
+    best_score, reached = 0, 0
+    empties = bin(free).count("1")
+    limit = empties if max_depth is None else min(max_depth, empties)
+    for depth in range(1, limit + 1):
+        try:
+            cell, score = search.root(me, opp, depth, best_cell)
+        except SearchTimeout:
+            break
+        best_cell, best_score, reached = cell, score, depth
+        if abs(score) > WIN_SCORE - game.size:
+            break  # forced win or loss found, deeper search cannot change it
+    if stats is not None:
+        stats["nodes"] = search.nodes
+    return best_cell, best_score, reached